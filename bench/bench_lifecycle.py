@@ -0,0 +1,315 @@
+# bench/bench_lifecycle.py
+# 대여 → 승인 → 본인 조회 → 반납 전체 흐름 + 공지/캠퍼스 조회 부하 테스트 (외부 네트워크 없이 로컬에서 실행)
+#   python bench/bench_lifecycle.py [--mode client|server|both] [--iterations 200] [--concurrency 8]
+#                                   [--stock-items 60] [--log-rows 20000] [--notices 500] [--teaser 5000]
+#                                   [--workers 2] [--threads 4] [--output result.json]
+# - 임시 폴더에 가짜 데이터(stuff_ongoing.xlsx, borrow_log.xlsx, 캠퍼스 엑셀, teaser_entries.csv, 공지)를 만들고
+#   init_db() 로 실제 서버와 같은 방식으로 이관한 뒤 측정 (저장소의 data/ 와 DB 는 건드리지 않음)
+# - client: Flask 테스트 클라이언트 (한 프로세스, 순차 실행) → 네트워크/서버 오버헤드 없는 앱 자체 비용
+# - server: gunicorn.conf.py 로 실제 멀티 워커 서버를 띄우고 --concurrency 개 스레드가 동시에 요청
+# 결과: 엔드포인트별 p50/p95/p99(ms), 실패 수, 초당 처리량 + 전체 처리량 (JSON)
+import os
+import sys
+import csv
+import json
+import time
+import random
+import socket
+import sqlite3
+import argparse
+import contextlib
+import tempfile
+import subprocess
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+REPO_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, REPO_DIR)
+
+from openpyxl import Workbook
+
+ADMIN_PASSWORD = 'bench'
+ITEMS = ['우산', '보조배터리', '충전기', '돗자리', '담요', '공학용계산기']
+STATUSES = ['신청', '미반납', '반납완료', '반납완료', '반납완료']
+LOG_COLUMNS = ['이름', '전화번호', '학번', '학과', '대여물품', '대여담당자', '대여시각', '대여현황', '반납담당자', '반납시각']
+TEASER_COLUMNS = ['신청시각', '이름', '학번', '학과', '전화번호', '동의여부']
+
+
+def percentile(values, p):
+    if not values:
+        return None
+    values = sorted(values)
+    idx = min(len(values) - 1, int(round(p / 100 * (len(values) - 1))))
+    return values[idx]
+
+
+# --- 가짜 데이터 ---
+def write_xlsx(path, header, rows):
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet()
+    ws.append(header)
+    for row in rows:
+        ws.append(row)
+    wb.save(path)
+
+
+def seed_files(data_dir, args):
+    os.makedirs(data_dir, exist_ok=True)
+    # 재고: 벤치 중 재고 부족으로 실패하지 않도록 넉넉하게 (반납물품 → 승인 시 미반납, 반납 시 복구)
+    stock = [[name, 10 ** 6, '반납물품'] for name in ITEMS]
+    stock += [[f'물품{i}', random.randint(0, 50), '일회용품' if i % 3 == 0 else '반납물품']
+              for i in range(max(0, args.stock_items - len(ITEMS)))]
+    write_xlsx(os.path.join(data_dir, 'stuff_ongoing.xlsx'), ['물품', '재고현황', '카테고리'], stock)
+
+    base = datetime.now() - timedelta(days=365)
+    log_rows = []
+    for _ in range(args.log_rows):
+        sid = random.randrange(5000)
+        status = random.choice(STATUSES)
+        borrowed = base + timedelta(seconds=random.randrange(365 * 24 * 3600))
+        log_rows.append([
+            f'학생{sid}', f'010{sid:08d}', f'20{sid:06d}', '공학부',
+            ', '.join(random.sample(ITEMS, random.randint(1, 3))),
+            '' if status == '신청' else '담당자', borrowed.strftime('%Y-%m-%d %H:%M:%S'), status,
+            '담당자' if status == '반납완료' else '',
+            (borrowed + timedelta(days=3)).strftime('%Y-%m-%d %H:%M:%S') if status == '반납완료' else '',
+        ])
+    write_xlsx(os.path.join(data_dir, 'borrow_log.xlsx'), LOG_COLUMNS, log_rows)
+
+    buildings = [[f'B{i}', f'건물{i}', f'{i}번 건물 설명'] for i in range(20)]
+    write_xlsx(os.path.join(data_dir, 'building_info.xlsx'), ['building_id', 'building_name', 'description'], buildings)
+    facilities = [[f'B{i % 20}', f'시설{i}', f'{i % 5 + 1}층', f'시설{i} 설명', ''] for i in range(200)]
+    write_xlsx(os.path.join(data_dir, 'facility_info.xlsx'),
+               ['building_id', 'facility_name', 'location', 'description', 'image_file'], facilities)
+    write_xlsx(os.path.join(data_dir, 'major.xlsx'), ['학과명'], [[f'학과{i}'] for i in range(40)])
+
+    with open(os.path.join(data_dir, 'teaser_entries.csv'), 'w', newline='', encoding='utf-8-sig') as f:
+        writer = csv.writer(f)
+        writer.writerow(TEASER_COLUMNS)
+        for i in range(args.teaser):
+            writer.writerow([base.strftime('%Y-%m-%d %H:%M:%S'), f'응모자{i}', f'19{i:06d}', '공학부', f'010{i:08d}', 'Y'])
+
+
+def seed_database(args):
+    # init_db() 가 엑셀/CSV 를 이관 → 공지는 직접 추가
+    from app import app, init_db
+    from models import db, Notice
+    init_db(app)
+    with app.app_context():
+        now = datetime.now()
+        db.session.execute(db.insert(Notice), [{
+            'title': f'공지 {i}', 'content': '본문 ' * 200, 'author': '여정 학생회', 'views': 0,
+            'fixed': i % 50 == 0, 'is_public': i % 10 != 0, 'created_at': now - timedelta(hours=i),
+        } for i in range(args.notices)])
+        db.session.commit()
+        db.session.remove()
+        db.engine.dispose()
+    return app
+
+
+# --- 시나리오 ---
+class Recorder:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.samples = {}   # 엔드포인트 -> [ms]
+        self.errors = {}    # 엔드포인트 -> 실패 수
+
+    def record(self, name, ms, ok):
+        with self._lock:
+            self.samples.setdefault(name, []).append(ms)
+            if not ok:
+                self.errors[name] = self.errors.get(name, 0) + 1
+
+    def report(self, elapsed):
+        total = sum(len(v) for v in self.samples.values())
+        endpoints = {}
+        for name, values in sorted(self.samples.items()):
+            endpoints[name] = {
+                'count': len(values),
+                'errors': self.errors.get(name, 0),
+                'p50_ms': round(percentile(values, 50), 3),
+                'p95_ms': round(percentile(values, 95), 3),
+                'p99_ms': round(percentile(values, 99), 3),
+                'rps': round(len(values) / elapsed, 1),
+            }
+        return {'requests': total, 'elapsed_s': round(elapsed, 3), 'rps': round(total / elapsed, 1),
+                'endpoints': endpoints}
+
+
+def pending_rental_id(db_path, student_id):
+    # 방금 신청한 기록의 id (승인/반납 요청에 필요, 측정 대상 아님)
+    with sqlite3.connect(db_path, timeout=30) as conn:
+        row = conn.execute(
+            "SELECT id FROM rentals WHERE student_id = ? AND status = '신청' ORDER BY id DESC LIMIT 1",
+            (student_id,)
+        ).fetchone()
+    return row[0] if row else None
+
+
+def run_lifecycle(call, db_path, i):
+    # call(측정 이름, method, path, JSON 본문) 으로 요청 하나를 보내고 기록
+    name, student_id = f'벤치{i}', f'99{i:06d}'
+    items = random.sample(ITEMS, random.randint(1, 2))
+    call('borrow', 'POST', '/api/borrow', {
+        'name': name, 'phone': f'010{i:08d}', 'student_id': student_id,
+        'department': '공학부', 'selected_items': items,
+    })
+    rental_id = pending_rental_id(db_path, student_id)
+    call('approve', 'POST', '/api/admin/approve', {'id': rental_id, 'handler': '벤치'})
+    call('check', 'POST', '/api/check', {'name': name, 'student_id': student_id})
+    call('return', 'POST', '/api/admin/return', {'id': rental_id, 'handler': '벤치'})
+    call('notices', 'GET', '/api/notices', None)
+    call('campus_info', 'GET', '/api/campus/info', None)
+
+
+def is_success(status_code, body):
+    if status_code != 200:
+        return False
+    return not isinstance(body, dict) or body.get('status', 'success') == 'success'
+
+
+def bench_client(app, db_path, args):
+    recorder = Recorder()
+    client = app.test_client()
+    client.post('/api/admin/login', json={'password': ADMIN_PASSWORD})
+
+    def call(name, method, path, payload):
+        t = time.perf_counter()
+        response = client.open(path, method=method, json=payload)
+        ms = (time.perf_counter() - t) * 1000
+        recorder.record(name, ms, is_success(response.status_code, response.get_json(silent=True)))
+
+    start = time.perf_counter()
+    for i in range(args.iterations):
+        run_lifecycle(call, db_path, i)
+    return recorder.report(time.perf_counter() - start)
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def wait_ready(base_url, proc, timeout=30):
+    import requests
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if proc.poll() is not None:
+            raise RuntimeError(f'gunicorn 이 종료됨 (code {proc.returncode})')
+        try:
+            if requests.get(base_url + '/api/schedule', timeout=1).status_code == 200:
+                return
+        except requests.ConnectionError:
+            pass
+        time.sleep(0.2)
+    raise RuntimeError('gunicorn 이 시작되지 않음')
+
+
+def bench_server(workdir, env, db_path, args):
+    import requests
+    port = free_port()
+    base_url = f'http://127.0.0.1:{port}'
+    proc = subprocess.Popen([
+        sys.executable, '-m', 'gunicorn', '-c', os.path.join(REPO_DIR, 'gunicorn.conf.py'),
+        '--pythonpath', REPO_DIR, '--bind', f'127.0.0.1:{port}',
+        '--workers', str(args.workers), '--threads', str(args.threads),
+        '--access-logfile', os.devnull, 'app:app',
+    ], cwd=workdir, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+    try:
+        wait_ready(base_url, proc)
+        recorder = Recorder()
+        local = threading.local()
+
+        def session():
+            if not hasattr(local, 'session'):
+                local.session = requests.Session()
+                local.session.post(base_url + '/api/admin/login', json={'password': ADMIN_PASSWORD})
+            return local.session
+
+        def call(name, method, path, payload):
+            s = session()
+            t = time.perf_counter()
+            try:
+                response = s.request(method, base_url + path, json=payload, timeout=60)
+                ms = (time.perf_counter() - t) * 1000
+                try:
+                    body = response.json()
+                except ValueError:
+                    body = None
+                recorder.record(name, ms, is_success(response.status_code, body))
+            except requests.RequestException:
+                recorder.record(name, (time.perf_counter() - t) * 1000, False)
+
+        # 클라이언트 모드와 학번이 겹치지 않도록 번호를 띄움
+        offset = args.iterations
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+            list(pool.map(lambda i: run_lifecycle(call, db_path, offset + i), range(args.iterations)))
+        result = recorder.report(time.perf_counter() - start)
+        result.update(workers=args.workers, threads=args.threads, concurrency=args.concurrency)
+        return result
+    finally:
+        proc.terminate()
+        try:
+            proc.wait(timeout=30)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--mode', choices=['client', 'server', 'both'], default='both')
+    parser.add_argument('--iterations', type=int, default=200)     # 대여~반납 흐름 반복 횟수 (흐름 1회 = 요청 6개)
+    parser.add_argument('--concurrency', type=int, default=8)      # server 모드 동시 요청 스레드 수
+    parser.add_argument('--stock-items', type=int, default=60)
+    parser.add_argument('--log-rows', type=int, default=20000)
+    parser.add_argument('--notices', type=int, default=500)
+    parser.add_argument('--teaser', type=int, default=5000)
+    parser.add_argument('--workers', type=int, default=2)
+    parser.add_argument('--threads', type=int, default=4)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--output', help='결과 JSON 을 저장할 파일 (기본: 표준 출력만)')
+    args = parser.parse_args()
+    random.seed(args.seed)
+    output = os.path.abspath(args.output) if args.output else None
+    cwd = os.getcwd()
+
+    with tempfile.TemporaryDirectory() as workdir:
+        db_path = os.path.join(workdir, 'data', 'database.db')
+        # 앱 모듈을 불러오기 전에 설정 (config.py / extensions.py 가 import 시점에 환경 변수를 읽음)
+        env = dict(os.environ,
+                   DB_PATH=db_path, ADMIN_PASSWORD=ADMIN_PASSWORD, FLASK_SECRET_KEY='bench',
+                   RATELIMIT_ENABLED='0', RATELIMIT_STORAGE_URI='memory://', OVERDUE_REPORT_FILE='',
+                   PROFILE_REQUESTS='0', METRICS_DIR='')
+        os.environ.update(env)
+        os.chdir(workdir)  # data/, uploads/ 상대 경로가 임시 폴더를 가리키도록
+
+        # 앱 로그(print)는 stderr 로 → stdout 에는 결과 JSON 만
+        with contextlib.redirect_stdout(sys.stderr):
+            seed_start = time.perf_counter()
+            seed_files(os.path.join(workdir, 'data'), args)
+            app = seed_database(args)
+            report = {
+                'config': {k: v for k, v in vars(args).items() if k != 'output'},
+                'seed_s': round(time.perf_counter() - seed_start, 3),
+            }
+
+            if args.mode in ('client', 'both'):
+                report['client'] = bench_client(app, db_path, args)
+            from extensions import run_shutdown_hooks
+            run_shutdown_hooks()  # 모아둔 쓰기(재고 엑셀 등)를 임시 폴더 안에서 정리 (이후 서버 시작)
+            if args.mode in ('server', 'both'):
+                report['server'] = bench_server(workdir, env, db_path, args)
+        os.chdir(cwd)
+
+    text = json.dumps(report, indent=2, ensure_ascii=False)
+    if output:
+        with open(output, 'w', encoding='utf-8') as f:
+            f.write(text)
+    print(text)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,86 @@
+# bench/bench_limiter.py
+# Rate limit 저장소 벤치마크
+#   python bench/bench_limiter.py [--iterations 5000] [--workers 4] [--budget-us 500]
+# 1) 요청 1건당 제한 확인(hit) 비용: memory:// vs sqlite:// (p50/p95/p99, 마이크로초)
+# 2) 여러 프로세스가 같은 키를 동시에 두드릴 때 허용 횟수가 정확히 limit 인지 확인
+# sqlite:// 의 p95 가 --budget-us 를 넘으면 종료 코드 1
+import os
+import sys
+import json
+import time
+import argparse
+import tempfile
+import multiprocessing as mp
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from limits import parse
+from limits.storage import storage_from_string
+from limits.strategies import MovingWindowRateLimiter, FixedWindowRateLimiter
+import services.limiter_storage  # noqa: F401  (sqlite:// 등록)
+
+
+def percentile(values, p):
+    values = sorted(values)
+    idx = min(len(values) - 1, int(round(p / 100 * (len(values) - 1))))
+    return values[idx]
+
+
+def measure(uri, strategy_cls, iterations, keys=200):
+    limiter = strategy_cls(storage_from_string(uri))
+    item = parse('1000000 per hour')  # 제한에 걸리지 않도록 크게
+    samples = []
+    for i in range(iterations):
+        t = time.perf_counter()
+        limiter.hit(item, f'127.0.0.{i % keys}', '/api/borrow')
+        samples.append((time.perf_counter() - t) * 1e6)
+    return {
+        'p50_us': round(percentile(samples, 50), 1),
+        'p95_us': round(percentile(samples, 95), 1),
+        'p99_us': round(percentile(samples, 99), 1),
+    }
+
+
+def _hammer(uri, attempts, queue):
+    limiter = MovingWindowRateLimiter(storage_from_string(uri))
+    item = parse('10 per minute')
+    queue.put(sum(1 for _ in range(attempts) if limiter.hit(item, 'same-client', '/api/borrow')))
+
+
+def shared_limit_check(uri, workers, attempts=20):
+    queue = mp.Queue()
+    procs = [mp.Process(target=_hammer, args=(uri, attempts, queue)) for _ in range(workers)]
+    for p in procs:
+        p.start()
+    for p in procs:
+        p.join()
+    allowed = sum(queue.get() for _ in procs)
+    return {'workers': workers, 'attempts': workers * attempts, 'limit': 10, 'allowed': allowed}
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--iterations', type=int, default=5000)
+    parser.add_argument('--workers', type=int, default=4)
+    parser.add_argument('--budget-us', type=float, default=500.0)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        sqlite_uri = f'sqlite:///{os.path.join(tmp, "limiter.db")}'
+        report = {
+            'memory_moving_window': measure('memory://', MovingWindowRateLimiter, args.iterations),
+            'sqlite_moving_window': measure(sqlite_uri, MovingWindowRateLimiter, args.iterations),
+            'sqlite_fixed_window': measure(sqlite_uri, FixedWindowRateLimiter, args.iterations),
+            'shared_limit': shared_limit_check(f'sqlite:///{os.path.join(tmp, "shared.db")}', args.workers),
+            'budget_us': args.budget_us,
+        }
+
+    ok = (report['sqlite_moving_window']['p95_us'] <= args.budget_us
+          and report['shared_limit']['allowed'] == report['shared_limit']['limit'])
+    report['ok'] = ok
+    print(json.dumps(report, indent=2))
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == '__main__':
+    main()
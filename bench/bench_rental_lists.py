@@ -0,0 +1,139 @@
+# bench/bench_rental_lists.py
+# 대여 조회 API(본인 조회 / 신청 목록 / 미반납 목록) 응답 생성 비용 비교
+#   python bench/bench_rental_lists.py [--rows 50000] [--repeat 20]
+# - iterrows: 기존 방식 (전체 기록 DataFrame → 필터 → iterrows + 행마다 strptime)
+#             ※ 엑셀을 읽는 시간은 빼고 이미 메모리에 있는 DataFrame 으로 측정 (기존 방식에 유리한 조건)
+# - sql:      현재 방식 (인덱스 조회 + 필요한 컬럼만, 반납 예정일은 SQL date() 로 계산)
+# 결과: 각 방식의 p50/p95 (밀리초)와 두 방식의 결과가 같은지 여부
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import tempfile
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import pandas as pd
+from flask import Flask
+from models import db, Rental
+from services import rental_ledger
+
+ITEMS = ['우산', '보조배터리', '충전기', '휴지', '돗자리', '담요']
+STATUSES = ['신청', '미반납', '반납완료', '반납완료', '반납완료']
+
+
+def percentile(values, p):
+    values = sorted(values)
+    idx = min(len(values) - 1, int(round(p / 100 * (len(values) - 1))))
+    return values[idx]
+
+
+def synthetic_rows(count, students):
+    base = datetime(2025, 3, 1)
+    for i in range(count):
+        sid = random.randrange(students)
+        status = random.choice(STATUSES)
+        borrowed = base + timedelta(seconds=random.randrange(365 * 24 * 3600))
+        yield {
+            'name': f'학생{sid}', 'phone': f'010{sid:08d}', 'student_id': f'20{sid:06d}', 'department': '공학부',
+            'items': ', '.join(random.sample(ITEMS, random.randint(1, 3))),
+            'borrow_handler': '' if status == '신청' else '담당자',
+            'borrowed_at': borrowed.strftime('%Y-%m-%d %H:%M:%S'),
+            'status': status,
+            'return_handler': '담당자' if status == '반납완료' else '',
+            'returned_at': (borrowed + timedelta(days=3)).strftime('%Y-%m-%d %H:%M:%S') if status == '반납완료' else '',
+        }
+
+
+# --- 기존 방식 (iterrows) ---
+def old_check(log_df, name, student_id):
+    matches = log_df[(log_df['이름'] == name) & (log_df['학번'] == student_id)].copy()
+    result_list = []
+    for _, row in matches.iterrows():
+        try:
+            borrow_dt = datetime.strptime(str(row['대여시각']), '%Y-%m-%d %H:%M:%S')
+            due_date = (borrow_dt + timedelta(days=7)).strftime('%Y-%m-%d')
+        except ValueError:
+            due_date = '-'
+        result_list.append({'items': row['대여물품'], 'date': str(row['대여시각']),
+                            'status': row['대여현황'], 'due_date': due_date})
+    result_list.reverse()
+    return result_list
+
+
+def old_status_list(log_df, status, with_phone=False):
+    log_df = log_df.copy()
+    log_df['id'] = log_df.index
+    rows = log_df[log_df['대여현황'] == status].copy()
+    data = []
+    for _, row in rows.iterrows():
+        item = {'id': int(row['id']), 'date': row['대여시각'], 'name': row['이름'], 'student_id': row['학번'],
+                'items': row['대여물품']}
+        if with_phone:
+            item['phone'] = row['전화번호']
+        data.append(item)
+    data.reverse()
+    return data
+
+
+def timed(fn, repeat):
+    samples = []
+    result = None
+    for _ in range(repeat):
+        t = time.perf_counter()
+        result = fn()
+        samples.append((time.perf_counter() - t) * 1000)
+    return result, {'p50_ms': round(percentile(samples, 50), 3), 'p95_ms': round(percentile(samples, 95), 3)}
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--rows', type=int, default=50000)
+    parser.add_argument('--students', type=int, default=5000)
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+    random.seed(42)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        app = Flask(__name__)
+        app.config['SQLALCHEMY_DATABASE_URI'] = f'sqlite:///{os.path.join(tmp, "bench.db")}'
+        db.init_app(app)
+        with app.app_context():
+            db.create_all()
+            db.session.execute(db.insert(Rental), list(synthetic_rows(args.rows, args.students)))
+            db.session.commit()
+
+            rentals = Rental.query.order_by(Rental.id).all()
+            log_df = pd.DataFrame([r.to_log_dict() for r in rentals], index=[r.id for r in rentals],
+                                  columns=rental_ledger.LOG_COLUMNS)
+            sample = rentals[len(rentals) // 2]
+            name, student_id = sample.name, sample.student_id
+
+            cases = {
+                'check': (lambda: old_check(log_df, name, student_id),
+                          lambda: rental_ledger.student_history(name, student_id)),
+                'requests': (lambda: old_status_list(log_df, '신청'),
+                             lambda: rental_ledger.status_rows('신청')),
+                'ongoing': (lambda: old_status_list(log_df, '미반납', with_phone=True),
+                            lambda: rental_ledger.status_rows('미반납', with_phone=True)),
+            }
+            report = {'rows': args.rows, 'repeat': args.repeat}
+            for case, (old_fn, new_fn) in cases.items():
+                old_result, old_stats = timed(old_fn, args.repeat)
+                new_result, new_stats = timed(new_fn, args.repeat)
+                report[case] = {
+                    'result_rows': len(new_result),
+                    'iterrows': old_stats,
+                    'sql': new_stats,
+                    'speedup_p50': round(old_stats['p50_ms'] / max(new_stats['p50_ms'], 1e-6), 1),
+                    'same_result': old_result == new_result,
+                }
+
+    print(json.dumps(report, indent=2, ensure_ascii=False))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,152 @@
+# bench/bench_sqlite_concurrency.py
+# SQLite 설정별 동시성 벤치마크 (쓰기가 계속 들어오는 동안 읽기 처리량/지연)
+#   python bench/bench_sqlite_concurrency.py [--readers 4] [--writers 2] [--duration 3] [--notices 500]
+# - default: PRAGMA 없음 (기존 설정, rollback journal)
+# - tuned:   config.SQLITE_PRAGMAS (WAL, synchronous=NORMAL, busy_timeout, mmap, cache)
+# 읽기: 공지 목록(20개) + 상세 1건 / 쓰기: 조회수 UPDATE 묶음 + 가끔 공지 INSERT (BEGIN IMMEDIATE)
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import tempfile
+import multiprocessing as mp
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import OperationalError
+from models import db
+from services.db_utils import apply_sqlite_pragmas
+from config import SQLITE_PRAGMAS
+
+LIST_SQL = text(
+    'SELECT id, title, author, views, fixed, created_at FROM notices WHERE is_public = 1 '
+    'ORDER BY fixed DESC, created_at DESC, id DESC LIMIT 20'
+)
+DETAIL_SQL = text('SELECT * FROM notices WHERE id = :id')
+
+
+def percentile(values, p):
+    if not values:
+        return None
+    values = sorted(values)
+    idx = min(len(values) - 1, int(round(p / 100 * (len(values) - 1))))
+    return values[idx]
+
+
+def make_engine(path, pragmas):
+    engine = create_engine(f'sqlite:///{path}')
+    apply_sqlite_pragmas(engine, pragmas)
+    return engine
+
+
+def seed(path, pragmas, notices):
+    engine = make_engine(path, pragmas)
+    db.metadata.create_all(engine, tables=[db.metadata.tables['notices']])
+    with engine.begin() as conn:
+        conn.execute(text(
+            "INSERT INTO notices (title, content, author, created_at, views, fixed, is_public) "
+            "VALUES (:title, :content, '여정 학생회', datetime('now', :ago), 0, :fixed, 1)"
+        ), [{'title': f'공지 {i}', 'content': '본문 ' * 200, 'ago': f'-{i} minutes', 'fixed': i % 50 == 0}
+            for i in range(notices)])
+    engine.dispose()
+
+
+def _reader(path, pragmas, notices, start, deadline, queue):
+    engine = make_engine(path, pragmas)
+    samples, errors = [], 0
+    while time.time() < start:
+        time.sleep(0.001)
+    with engine.connect() as conn:
+        while time.time() < deadline:
+            t = time.perf_counter()
+            try:
+                conn.execute(LIST_SQL).all()
+                conn.execute(DETAIL_SQL, {'id': random.randint(1, notices)}).first()
+                conn.rollback()
+                samples.append((time.perf_counter() - t) * 1000)
+            except OperationalError:
+                conn.rollback()
+                errors += 1
+    queue.put(('read', samples, errors))
+
+
+def _writer(path, pragmas, notices, start, deadline, queue):
+    engine = make_engine(path, pragmas)
+    samples, errors = [], 0
+    while time.time() < start:
+        time.sleep(0.001)
+    with engine.connect() as conn:
+        while time.time() < deadline:
+            t = time.perf_counter()
+            try:
+                conn.exec_driver_sql('BEGIN IMMEDIATE')
+                conn.execute(text('UPDATE notices SET views = views + :n WHERE id = :id'),
+                             [{'id': random.randint(1, notices), 'n': 1} for _ in range(20)])
+                if random.random() < 0.1:
+                    conn.execute(text(
+                        "INSERT INTO notices (title, content, author, created_at, views, fixed, is_public) "
+                        "VALUES ('새 공지', :content, '여정 학생회', datetime('now'), 0, 0, 1)"
+                    ), {'content': '본문 ' * 200})
+                conn.commit()
+                samples.append((time.perf_counter() - t) * 1000)
+            except OperationalError:
+                conn.rollback()
+                errors += 1
+    queue.put(('write', samples, errors))
+
+
+def run_profile(name, pragmas, args, tmp):
+    path = os.path.join(tmp, f'{name}.db')
+    seed(path, pragmas, args.notices)
+
+    queue = mp.Queue()
+    start = time.time() + 0.5
+    deadline = start + args.duration
+    procs = [mp.Process(target=_reader, args=(path, pragmas, args.notices, start, deadline, queue))
+             for _ in range(args.readers)]
+    procs += [mp.Process(target=_writer, args=(path, pragmas, args.notices, start, deadline, queue))
+              for _ in range(args.writers)]
+    for p in procs:
+        p.start()
+    results = [queue.get() for _ in procs]
+    for p in procs:
+        p.join()
+
+    report = {'pragmas': pragmas}
+    for kind in ('read', 'write'):
+        samples = [s for k, ss, _ in results if k == kind for s in ss]
+        report[kind] = {
+            'ops': len(samples),
+            'ops_per_sec': round(len(samples) / args.duration, 1),
+            'errors': sum(e for k, _, e in results if k == kind),
+            'p50_ms': round(percentile(samples, 50) or 0, 3),
+            'p95_ms': round(percentile(samples, 95) or 0, 3),
+            'p99_ms': round(percentile(samples, 99) or 0, 3),
+        }
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--readers', type=int, default=4)
+    parser.add_argument('--writers', type=int, default=2)
+    parser.add_argument('--duration', type=float, default=3.0)
+    parser.add_argument('--notices', type=int, default=500)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        report = {
+            'readers': args.readers,
+            'writers': args.writers,
+            'duration_s': args.duration,
+            'default': run_profile('default', {}, args, tmp),
+            'tuned': run_profile('tuned', dict(SQLITE_PRAGMAS), args, tmp),
+        }
+    print(json.dumps(report, indent=2, ensure_ascii=False))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,52 @@
+# config.py
+# 경로/시간대 등 여러 모듈이 같이 쓰는 설정값
+import os
+from datetime import timedelta, timezone
+
+BASE_DIR = os.path.abspath(os.path.dirname(__file__))
+
+# 한국 시간(KST) 설정
+KST = timezone(timedelta(hours=9))
+
+# --- 데이터 파일 ---
+DATA_DIR = 'data'
+STOCK_FILE = os.path.join(DATA_DIR, 'stuff_ongoing.xlsx')
+LOG_FILE = os.path.join(DATA_DIR, 'borrow_log.xlsx')
+MAJOR_FILE = os.path.join(DATA_DIR, 'major.xlsx')
+TEASER_FILE = os.path.join(DATA_DIR, 'teaser_entries.csv')
+SETTINGS_FILE = os.path.join(BASE_DIR, 'settings.json')
+EXPORT_DIR = os.path.join(DATA_DIR, 'exports')  # 다운로드용 엑셀 캐시 (데이터 버전별)
+
+# --- 업로드 파일 ---
+UPLOAD_DIR = 'uploads'
+# 파일 전송을 앞단 웹서버에 맡기기: '' (직접 전송) / 'x-accel' (nginx) / 'x-sendfile' (Apache 등)
+UPLOAD_OFFLOAD = os.getenv('UPLOAD_OFFLOAD', '')
+UPLOAD_ACCEL_PREFIX = os.getenv('UPLOAD_ACCEL_PREFIX', '/_uploads/')  # nginx internal location
+
+# --- 계측 (요청/구간별 소요 시간) ---
+METRICS_DIR = os.getenv('METRICS_DIR', os.path.join(DATA_DIR, 'metrics'))  # 워커별 스냅샷 ('' 이면 워커마다 따로 집계)
+# 요청 단위 프로파일링 결과 (PROFILE_REQUESTS=1 일 때만)
+PROFILE_DIR = os.path.join(DATA_DIR, 'profiles') if os.getenv('PROFILE_REQUESTS') == '1' else ''
+
+# DB 설정 (SQLite)
+DB_PATH = os.getenv('DB_PATH', os.path.join(BASE_DIR, 'data', 'database.db'))  # 벤치마크 등에서 다른 DB 로 실행할 때
+
+# SQLite 연결마다 적용할 PRAGMA (환경 변수로 변경 가능, 빈 값이면 적용 안 함)
+# - WAL: 쓰는 중에도 읽기가 막히지 않음 / synchronous=NORMAL: WAL 에서는 commit 마다 fsync 하지 않아도 안전
+# - busy_timeout: 다른 프로세스가 쓰기 잠금을 잡고 있으면 바로 실패하지 않고 기다림(ms)
+# - mmap_size(바이트), cache_size(음수면 KiB 단위)
+SQLITE_PRAGMAS = {
+    'journal_mode': os.getenv('SQLITE_JOURNAL_MODE', 'WAL'),
+    'synchronous': os.getenv('SQLITE_SYNCHRONOUS', 'NORMAL'),
+    'busy_timeout': os.getenv('SQLITE_BUSY_TIMEOUT_MS', '5000'),
+    'mmap_size': os.getenv('SQLITE_MMAP_SIZE', str(256 * 1024 * 1024)),
+    'cache_size': os.getenv('SQLITE_CACHE_SIZE', '-20000'),
+}
+
+# CORS 허용 도메인
+ALLOWED_ORIGINS = [
+    "http://localhost:3000",             # 로컬 개발용
+    "http://localhost:5173",             # 로컬 개발용
+    "http://localhost:5174",             # 로컬 개발용
+    "https://cukeng.kr"                  # 여정 도메인
+]
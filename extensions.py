@@ -1,14 +1,25 @@
 # extensions.py
+import os
+import atexit
 from flask_limiter import Limiter
 from flask_limiter.util import get_remote_address
 from flask import session, jsonify
 from functools import wraps
+from config import STOCK_FILE, SETTINGS_FILE
+from services.stock_store import StockStore
+from services.view_counter import ViewCounter
+from services.teaser_entries import TeaserWriter
+from services.overdue_sweeper import OverdueSweeper
+from services.settings_store import SettingsStore
+import services.limiter_storage  # noqa: F401  (sqlite:// 저장소 등록)
 
 # 1. Limiter 객체 생성 (app 없이 먼저 껍데기만 생성)
+# [수정] 워커 프로세스끼리 제한 횟수를 공유하도록 SQLite 저장소 사용 (memory:// 는 워커마다 따로 셈)
 limiter = Limiter(
     key_func=get_remote_address,
     default_limits=["200 per day", "50 per hour"],
-    storage_uri="memory://"
+    storage_uri=os.getenv('RATELIMIT_STORAGE_URI', 'sqlite:///data/limiter.db'),
+    strategy=os.getenv('RATELIMIT_STRATEGY', 'moving-window')
 )
 
 # 2. 로그인 필수 데코레이터 이동
@@ -18,4 +29,50 @@ def login_required(f):
         if not session.get('is_admin'):
             return jsonify({'status': 'fail', 'message': '로그인이 필요합니다.'}), 401
         return f(*args, **kwargs)
-    return decorated_function
\ No newline at end of file
+    return decorated_function
+
+# 3. [보안] 엑셀 인젝션 방지 함수 (입력값 맨 앞이 =, +, -, @ 이면 ' 붙이기)
+def sanitize_input(value):
+    if isinstance(value, str) and value.startswith(('=', '+', '-', '@')):
+        return "'" + value
+    return value
+
+# 4. [NEW] 재고 저장소 (원본은 DB, 조회는 메모리 캐시, 엑셀은 백그라운드로 갱신되는 사본)
+stock_store = StockStore(STOCK_FILE)
+
+# 5. [NEW] 공지 조회수 누적기 (모아서 VIEW_FLUSH_INTERVAL 초마다 DB 반영)
+view_counter = ViewCounter(flush_interval=float(os.getenv('VIEW_FLUSH_INTERVAL', '5')))
+
+# 6. [NEW] 티저 응모 저장기 (동시에 들어온 응모를 모아서 한 트랜잭션으로 저장)
+teaser_writer = TeaserWriter()
+
+# 7. [NEW] 연체 목록 리포트 (OVERDUE_REPORT_FILE 을 지정했을 때만, OVERDUE_SWEEP_INTERVAL 초마다)
+overdue_sweeper = OverdueSweeper(
+    report_path=os.getenv('OVERDUE_REPORT_FILE', ''),
+    interval=float(os.getenv('OVERDUE_SWEEP_INTERVAL', '3600'))
+)
+
+# 8. [NEW] 시스템 설정 (settings.json, 메모리 캐시 + 원자적 저장)
+settings_store = SettingsStore(SETTINGS_FILE, defaults={'snowfall': False})
+
+# 9. [NEW] 프로세스 종료 시 실행할 작업 (백그라운드 저장 버퍼 비우기 등)
+# gunicorn 워커 종료(worker_exit)와 일반 종료(atexit) 모두에서 호출됨
+_shutdown_hooks = []
+_shutdown_done = False
+
+def on_shutdown(f):
+    _shutdown_hooks.append(f)
+    return f
+
+def run_shutdown_hooks():
+    global _shutdown_done
+    if _shutdown_done:
+        return
+    _shutdown_done = True
+    for hook in _shutdown_hooks:
+        try:
+            hook()
+        except Exception as e:
+            print(f"[shutdown] {getattr(hook, '__qualname__', hook)} 실패: {e}")
+
+atexit.register(run_shutdown_hooks)
@@ -0,0 +1,64 @@
+# gunicorn.conf.py
+# 운영 서버 설정: gunicorn -c gunicorn.conf.py app:app
+# 값은 환경 변수로 덮어쓸 수 있음 (docker-compose.yml 의 environment)
+import os
+import time
+import multiprocessing
+
+bind = os.getenv('GUNICORN_BIND', '0.0.0.0:5000')
+
+# 워커 수: 기본 (CPU * 2) + 1, 단 SQLite 쓰기는 한 번에 하나이므로 최대 8개로 제한
+workers = int(os.getenv('WEB_CONCURRENCY', min(multiprocessing.cpu_count() * 2 + 1, 8)))
+# 엑셀/DB 대기 시간 동안 다른 요청을 받도록 워커당 스레드 사용
+worker_class = 'gthread'
+threads = int(os.getenv('GUNICORN_THREADS', 4))
+
+# 마스터에서 앱을 한 번 로드하고 fork → 워커 부팅이 빠르고 메모리 공유
+# (HUP 으로는 코드가 다시 로드되지 않음 → 코드 변경 시 전체 재시작 또는 USR2 + WINCH, README 참고)
+preload_app = True
+
+timeout = int(os.getenv('GUNICORN_TIMEOUT', 60))
+graceful_timeout = 30   # HUP/TERM 시 처리 중인 요청을 마칠 시간
+keepalive = 5
+
+# 메모리 누수 대비: 일정 요청 수마다 워커를 하나씩 교체 (동시에 교체되지 않도록 jitter)
+max_requests = 2000
+max_requests_jitter = 200
+
+accesslog = '-'
+errorlog = '-'
+
+
+def on_starting(server):
+    # DB 테이블 생성/초기 데이터/엑셀 이관은 마스터에서 한 번만
+    from app import app, init_db, warm_up
+    from services.metrics import metrics
+    init_db(app)
+    metrics.clear_shared()  # 이전 실행의 워커별 계측값 정리
+    # 재고/학과/캠퍼스 캐시를 마스터에서 미리 채움 → fork 된 워커는 첫 요청부터 캐시 사용
+    if os.getenv('WARMUP', '1') == '1':
+        warm_up(app)
+
+
+def post_fork(server, worker):
+    worker.boot_started = time.perf_counter()
+    # fork 전에 열려 있던 DB 연결은 버리고 워커마다 새로 연결
+    from app import app
+    from models import db
+    from extensions import overdue_sweeper
+    with app.app_context():
+        db.engine.dispose(close=False)
+    # 연체 리포트 작업 (OVERDUE_REPORT_FILE 설정 시, 워커 중 하나만 실제 실행)
+    overdue_sweeper.start()
+
+
+def post_worker_init(worker):
+    # fork 부터 요청을 받을 준비가 될 때까지 걸린 시간
+    from services.metrics import metrics
+    metrics.record_startup('worker_boot', time.perf_counter() - worker.boot_started)
+
+
+def worker_exit(server, worker):
+    # 워커 종료/교체(graceful reload) 시 백그라운드 저장 버퍼 비우기
+    from extensions import run_shutdown_hooks
+    run_shutdown_hooks()
@@ -18,6 +18,11 @@ class Notice(db.Model):
     files = db.relationship('NoticeFile', backref='notice', cascade='all, delete-orphan')
     is_public = db.Column(db.Boolean, default=True)
 
+    # 목록 조회(공개글 필터 + 고정글 우선 + 최신순)용 복합 인덱스
+    __table_args__ = (
+        db.Index('ix_notices_public_fixed_created', 'is_public', 'fixed', 'created_at'),
+    )
+
     def to_dict(self):
         return {
             'id': self.id,
@@ -31,6 +36,19 @@ class Notice(db.Model):
             'files': [f.to_dict() for f in self.files]
         }
 
+    # [NEW] 목록용 (본문 content 제외)
+    def to_list_dict(self):
+        return {
+            'id': self.id,
+            'title': self.title,
+            'author': self.author,
+            'views': self.views,
+            'fixed': self.fixed,
+            'is_public': self.is_public,
+            'date': self.created_at.strftime('%Y-%m-%d'),
+            'files': [f.to_dict() for f in self.files]
+        }
+
 # 2. [신규] 첨부파일 테이블
 class NoticeFile(db.Model):
     __tablename__ = 'notice_files'
@@ -70,4 +88,117 @@ class InstaPost(db.Model):
             'id': self.id,
             'img_filename': self.img_filename,
             'link_url': self.link_url
-        }
\ No newline at end of file
+        }
+
+# 5. [NEW] 대여/반납 기록 테이블 (borrow_log.xlsx 대체)
+# 엑셀과 같은 값(문자열)을 그대로 저장하고, 엑셀은 다운로드할 때만 만들어 씀
+class Rental(db.Model):
+    __tablename__ = 'rentals'
+
+    id = db.Column(db.Integer, primary_key=True)
+    name = db.Column(db.String(50), default='')             # 이름
+    phone = db.Column(db.String(50), default='')            # 전화번호
+    student_id = db.Column(db.String(50), default='')       # 학번
+    department = db.Column(db.String(100), default='')     # 학과
+    items = db.Column(db.Text, default='')                  # 대여물품 (", " 로 구분)
+    borrow_handler = db.Column(db.String(50), default='')   # 대여담당자
+    borrowed_at = db.Column(db.String(20), default='')      # 대여시각 (YYYY-MM-DD HH:MM:SS)
+    status = db.Column(db.String(20), default='신청')        # 대여현황 (신청/미반납/반납완료)
+    return_handler = db.Column(db.String(50), default='')   # 반납담당자
+    returned_at = db.Column(db.String(20), default='')      # 반납시각
+
+    # 조회 패턴별 인덱스: 상태별 목록(신청/미반납) 및 연체 조회(미반납 + 대여시각순), 본인 조회(이름+학번), 날짜 범위
+    __table_args__ = (
+        db.Index('ix_rentals_status_borrowed_at', 'status', 'borrowed_at'),
+        db.Index('ix_rentals_name_student_id', 'name', 'student_id'),
+        db.Index('ix_rentals_borrowed_at', 'borrowed_at'),
+    )
+
+    # 엑셀 컬럼명 <-> 속성명
+    LOG_FIELDS = {
+        '이름': 'name',
+        '전화번호': 'phone',
+        '학번': 'student_id',
+        '학과': 'department',
+        '대여물품': 'items',
+        '대여담당자': 'borrow_handler',
+        '대여시각': 'borrowed_at',
+        '대여현황': 'status',
+        '반납담당자': 'return_handler',
+        '반납시각': 'returned_at',
+    }
+
+    def to_log_dict(self):
+        # 기존 borrow_log.xlsx 한 행과 같은 모양 (한글 컬럼명)
+        return {col: getattr(self, attr) or '' for col, attr in self.LOG_FIELDS.items()}
+
+
+# 6. [NEW] 재고 테이블 (stuff_ongoing.xlsx 대신 원본 역할, 엑셀은 사본으로 계속 저장)
+class StockItem(db.Model):
+    __tablename__ = 'stock_items'
+
+    id = db.Column(db.Integer, primary_key=True)                    # 엑셀 행 순서
+    name = db.Column(db.String(100), nullable=False, index=True)   # 물품
+    count = db.Column(db.Integer, nullable=False, default=0)       # 재고현황
+    category = db.Column(db.String(50), default='')                # 카테고리
+
+    def to_dict(self):
+        return {'물품': self.name, '재고현황': self.count, '카테고리': self.category or ''}
+
+
+# 7. [NEW] 저장소별 데이터 버전 (여러 워커 프로세스가 메모리 캐시를 맞추는 용도)
+class StoreVersion(db.Model):
+    __tablename__ = 'store_versions'
+
+    name = db.Column(db.String(50), primary_key=True)        # 예: 'stock'
+    version = db.Column(db.Integer, nullable=False, default=0)
+    file_mtime = db.Column(db.BigInteger)                    # 연결된 엑셀 파일의 마지막 mtime(ns)
+
+# 8. [NEW] 티저 이벤트 응모 테이블 (teaser_entries.csv 대체)
+class TeaserEntry(db.Model):
+    __tablename__ = 'teaser_entries'
+
+    id = db.Column(db.Integer, primary_key=True)
+    entered_at = db.Column(db.String(20), default='')       # 신청시각 (YYYY-MM-DD HH:MM:SS)
+    name = db.Column(db.String(50), default='')             # 이름
+    student_id = db.Column(db.String(50), default='')       # 학번
+    department = db.Column(db.String(100), default='')     # 학과
+    phone = db.Column(db.String(50), default='')            # 전화번호 (앞자리 0 보존을 위해 문자열)
+    agreed = db.Column(db.String(1), default='Y')           # 동의여부 (Y/N)
+
+    # 관리자 목록(최신순), 학번 검색/중복 확인
+    __table_args__ = (
+        db.Index('ix_teaser_entries_entered_at', 'entered_at'),
+        db.Index('ix_teaser_entries_student_id', 'student_id'),
+    )
+
+    # CSV 컬럼명 <-> 속성명
+    CSV_FIELDS = {
+        '신청시각': 'entered_at',
+        '이름': 'name',
+        '학번': 'student_id',
+        '학과': 'department',
+        '전화번호': 'phone',
+        '동의여부': 'agreed',
+    }
+
+    def to_csv_dict(self):
+        # 기존 teaser_entries.csv 한 행과 같은 모양 (한글 컬럼명)
+        return {col: getattr(self, attr) or '' for col, attr in self.CSV_FIELDS.items()}
+
+# 9. [NEW] 대여 통계 (대시보드/추이용 집계, 대여 기록이 바뀔 때 같은 트랜잭션에서 갱신)
+# kind='day'    key='YYYY-MM-DD' → 그날 대여 신청 건수
+# kind='status' key=대여현황      → 현재 그 상태인 기록 수
+# kind='item'   key=물품명        → 누적 대여 횟수
+class RentalStat(db.Model):
+    __tablename__ = 'rental_stats'
+
+    kind = db.Column(db.String(10), primary_key=True)
+    key = db.Column(db.String(100), primary_key=True)
+    count = db.Column(db.Integer, nullable=False, default=0)
+
+# 이미 만들어진 테이블에 나중에 추가된 인덱스 생성 (create_all 은 기존 테이블의 인덱스를 만들지 않음)
+def create_missing_indexes():
+    for table in db.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(db.engine, checkfirst=True)
@@ -1,7 +1,9 @@
 # routes/campus_routes.py
-from flask import Blueprint, jsonify, send_from_directory
-import pandas as pd
+from flask import Blueprint, jsonify
 import os
+from services.xlsx_utils import read_rows
+from services.file_cache import FileBackedJSON
+from services import thumbnails, uploads
 
 campus_bp = Blueprint('campus', __name__, url_prefix='/api/campus')
 
@@ -11,44 +13,68 @@ BUILDING_FILE = os.path.join(BASE_DIR, 'data', 'building_info.xlsx')
 FACILITY_FILE = os.path.join(BASE_DIR, 'data', 'facility_info.xlsx')
 IMAGE_FOLDER = os.path.join(BASE_DIR, 'uploads', 'campus')
 
+def _cell(row, key):
+    # pandas fillna('') 와 같게 빈 칸은 '' 로
+    value = row.get(key)
+    return '' if value is None else value
+
+# 응답에 들어간 이미지 파일들 (이미지가 교체되면 URL 의 ?v= 도 바뀌도록 캐시 변경 감지 대상에 포함)
+_image_files = []
+
+def campus_info_paths():
+    return [BUILDING_FILE, FACILITY_FILE] + _image_files
+
+# 건물 → 시설 목록 인덱스 생성 (엑셀이나 이미지가 바뀌었을 때만 실행됨)
+def build_campus_info():
+    result = {}
+    image_files = []
+
+    # --- Step 1: 건물 기본 정보 읽기 (building_info.xlsx) ---
+    for row in read_rows(BUILDING_FILE):
+        b_id = str(_cell(row, 'building_id')).strip() # 공백 제거 등 안전처리
+        result[b_id] = {
+            'name': _cell(row, 'building_name'),
+            'description': _cell(row, 'description'),
+            'facilities': [] # 시설 리스트 초기화
+        }
+
+    # --- Step 2: 시설 상세 정보 읽기 (facility_info.xlsx) ---
+    if os.path.exists(FACILITY_FILE):
+        for row in read_rows(FACILITY_FILE):
+            b_id = str(_cell(row, 'building_id')).strip()
+
+            # 건물 정보가 존재하는 경우에만 시설 추가
+            if b_id in result:
+                img_file = _cell(row, 'image_file') # 컬럼이 없을 수도 있으므로 '' 처리
+                img_url = None
+                if img_file:
+                    # [수정] 팝업 크기에 맞는 축소본(1280px) + 내용 해시(?v=) → 장기 캐시
+                    img_url = uploads.versioned_url(f"/api/campus/image/{img_file}?w=1280", IMAGE_FOLDER, str(img_file))
+                    image_files.append(os.path.join(IMAGE_FOLDER, str(img_file)))
+
+                facility_data = {
+                    'name': _cell(row, 'facility_name'),
+                    'loc': _cell(row, 'location'),
+                    'desc': _cell(row, 'description'),
+                    'imgUrl': img_url
+                }
+                result[b_id]['facilities'].append(facility_data)
+
+    _image_files[:] = image_files
+    return {'status': 'success', 'data': result}
+
+# [NEW] 미리 직렬화된 응답 캐시 (두 엑셀이나 응답에 들어간 이미지 중 하나라도 바뀌면 다시 생성)
+campus_info_cache = FileBackedJSON(campus_info_paths, build_campus_info)
+
 # 1. 캠퍼스 정보 통합 조회 API
 @campus_bp.route('/info', methods=['GET'])
 def get_campus_info():
     try:
-        result = {}
-
-        # --- Step 1: 건물 기본 정보 읽기 (building_info.xlsx) ---
-        if os.path.exists(BUILDING_FILE):
-            df_b = pd.read_excel(BUILDING_FILE).fillna('')
-            for _, row in df_b.iterrows():
-                b_id = str(row['building_id']).strip() # 공백 제거 등 안전처리
-                result[b_id] = {
-                    'name': row['building_name'],
-                    'description': row['description'],
-                    'facilities': [] # 시설 리스트 초기화
-                }
-        else:
+        if not os.path.exists(BUILDING_FILE):
             return jsonify({'status': 'error', 'message': '건물 정보 파일이 없습니다.'}), 500
 
-        # --- Step 2: 시설 상세 정보 읽기 (facility_info.xlsx) ---
-        if os.path.exists(FACILITY_FILE):
-            df_f = pd.read_excel(FACILITY_FILE).fillna('')
-            for _, row in df_f.iterrows():
-                b_id = str(row['building_id']).strip()
-                
-                # 건물 정보가 존재하는 경우에만 시설 추가
-                if b_id in result:
-                    img_file = row.get('image_file', '') # 컬럼이 없을 수도 있으므로 get 사용
-                    
-                    facility_data = {
-                        'name': row['facility_name'],
-                        'loc': row['location'],
-                        'desc': row['description'],
-                        'imgUrl': f"/api/campus/image/{img_file}" if img_file else None
-                    }
-                    result[b_id]['facilities'].append(facility_data)
-
-        return jsonify({'status': 'success', 'data': result})
+        # [수정] 매 요청마다 엑셀을 읽지 않고 캐시된 JSON 전송 (ETag 일치 시 304)
+        return campus_info_cache.response()
 
     except Exception as e:
         print(f"Error: {e}") # 디버깅용 로그
@@ -57,6 +83,6 @@ def get_campus_info():
 # 2. 팝업 이미지 제공 API
 @campus_bp.route('/image/<filename>')
 def get_campus_image(filename):
-    if not os.path.exists(IMAGE_FOLDER):
-        os.makedirs(IMAGE_FOLDER)
-    return send_from_directory(IMAGE_FOLDER, filename)
\ No newline at end of file
+    # [수정] 요청마다 폴더 확인/생성하지 않음 (없는 파일은 404)
+    # ?w= 가 있으면 축소본 (처음 요청될 때 원본 옆에 생성)
+    return thumbnails.send_image(IMAGE_FOLDER, filename)
\ No newline at end of file
@@ -1,9 +1,10 @@
 # routes/instagram_routes.py
-from flask import Blueprint, request, jsonify, send_from_directory
+from flask import Blueprint, request, jsonify
 from werkzeug.utils import secure_filename
 import os
 from models import db, InstaPost
 from extensions import limiter, login_required
+from services import thumbnails, uploads
 
 insta_bp = Blueprint('instagram', __name__, url_prefix='/api/instagram')
 
@@ -26,10 +27,14 @@ def get_posts():
     
     data = []
     for post in posts:
+        url = f"/api/instagram/image/{post.img_filename}"
+        version = uploads.fingerprint(INSTA_UPLOAD_FOLDER, post.img_filename)  # 내용이 바뀌면 URL 도 바뀜 → 장기 캐시
         data.append({
             'id': post.id,
             # 프론트에서 보여줄 이미지 URL (API 경로)
-            'imgUrl': f"/api/instagram/image/{post.img_filename}", 
+            # [수정] 타일 크기에 맞는 축소본(640px) 사용, 화면 밀도별 선택용 srcset 도 제공
+            'imgUrl': f"{url}?w=640" + (f"&v={version}" if version else ""), 
+            'srcset': thumbnails.srcset(url, version=version),
             'link': post.link_url
         })
     
@@ -57,6 +62,12 @@ def create_post():
         filename = f"{int(time.time())}_{filename}"
         
         file.save(os.path.join(INSTA_UPLOAD_FOLDER, filename))
+
+        # [NEW] 축소본(WebP/JPEG) 미리 생성 (실패해도 원본은 그대로 사용 가능)
+        try:
+            thumbnails.make_variants(INSTA_UPLOAD_FOLDER, filename)
+        except Exception as e:
+            print(f"[thumbnails] {filename} 축소본 생성 실패: {e}")
         
         new_post = InstaPost(img_filename=filename, link_url=link_url)
         db.session.add(new_post)
@@ -76,6 +87,7 @@ def delete_post(id):
     file_path = os.path.join(INSTA_UPLOAD_FOLDER, post.img_filename)
     if os.path.exists(file_path):
         os.remove(file_path)
+    thumbnails.delete_variants(INSTA_UPLOAD_FOLDER, post.img_filename)
         
     db.session.delete(post)
     db.session.commit()
@@ -84,4 +96,5 @@ def delete_post(id):
 # --- 4. 이미지 파일 제공 (GET) ---
 @insta_bp.route('/image/<filename>')
 def get_image(filename):
-    return send_from_directory(INSTA_UPLOAD_FOLDER, filename)
\ No newline at end of file
+    # ?w= 가 있으면 축소본
+    return thumbnails.send_image(INSTA_UPLOAD_FOLDER, filename)
\ No newline at end of file
@@ -1,9 +1,13 @@
 # routes/notice_routes.py
-from flask import Blueprint, request, jsonify, send_from_directory, session
+from flask import Blueprint, request, jsonify, session
 import os
 import shutil 
+from datetime import datetime
+from sqlalchemy import and_, or_
+from sqlalchemy.orm import defer, selectinload
 from models import db, Notice, NoticeFile
-from extensions import limiter, login_required
+from extensions import limiter, login_required, view_counter
+from services import uploads
 
 notice_bp = Blueprint('notice', __name__, url_prefix='/api/notices')
 
@@ -13,7 +17,17 @@ ALLOWED_EXTENSIONS = {'png', 'jpg', 'jpeg', 'gif', 'pdf', 'hwp', 'docx', 'xlsx'}
 def allowed_file(filename):
     return '.' in filename and filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
 
+# [NEW] 목록 페이지네이션 커서: 마지막 글의 (고정여부, 작성시각, id)
+def encode_cursor(notice):
+    return f"{int(bool(notice.fixed))}|{notice.created_at.isoformat()}|{notice.id}"
+
+def decode_cursor(cursor):
+    fixed, created_at, notice_id = cursor.split('|')
+    return int(fixed), datetime.fromisoformat(created_at), int(notice_id)
+
 # --- 1. 목록 조회 (GET) ---
+# ?limit=20 을 주면 20개씩 (다음 페이지 커서는 X-Next-Cursor 헤더, 다음 요청에 ?cursor= 로 전달)
+# limit 이 없으면 기존처럼 전체 목록
 @notice_bp.route('', methods=['GET'])
 @limiter.limit("30 per minute")
 def get_notices():
@@ -25,11 +39,36 @@ def get_notices():
     if session.get('is_admin') and request.args.get('include_private') == 'true':
         # 필터 없이 모든 글 조회 (query 재정의)
         query = Notice.query
-        
+
+    # [수정] 목록에는 본문(content)을 읽지 않고, 첨부파일은 한 번의 쿼리로 같이 로드 (N+1 방지)
+    query = query.options(defer(Notice.content), selectinload(Notice.files))
+
+    cursor = request.args.get('cursor')
+    if cursor:
+        try:
+            fixed, created_at, notice_id = decode_cursor(cursor)
+        except ValueError:
+            return jsonify({'error': '잘못된 커서입니다.'}), 400
+        # 정렬 순서(고정글 → 최신순 → id) 기준으로 커서 다음 글부터 (keyset pagination)
+        query = query.filter(or_(
+            Notice.fixed < fixed,
+            and_(Notice.fixed == fixed, Notice.created_at < created_at),
+            and_(Notice.fixed == fixed, Notice.created_at == created_at, Notice.id < notice_id),
+        ))
+
     # 정렬: 고정글 우선 -> 최신순
-    notices = query.order_by(Notice.fixed.desc(), Notice.created_at.desc()).all()
-    
-    return jsonify([n.to_dict() for n in notices])
+    query = query.order_by(Notice.fixed.desc(), Notice.created_at.desc(), Notice.id.desc())
+
+    limit = request.args.get('limit', type=int)
+    if not limit:
+        return jsonify([n.to_list_dict() for n in query.all()])
+
+    limit = max(1, min(limit, 100))
+    notices = query.limit(limit + 1).all()  # 1개 더 읽어서 다음 페이지 존재 여부 확인
+    resp = jsonify([n.to_list_dict() for n in notices[:limit]])
+    if len(notices) > limit:
+        resp.headers['X-Next-Cursor'] = encode_cursor(notices[limit - 1])
+    return resp
 
 # --- 2. 상세 조회 + 조회수 증가 (GET) ---
 @notice_bp.route('/<int:id>', methods=['GET'])
@@ -39,11 +78,13 @@ def get_notice_detail(id):
     
     # [확인 완료] URL 파라미터가 'true'일 때만 조회수 증가
     # 프론트엔드에서 /api/notices/1?increment=false 로 요청하면 절대 안 오름
+    # [수정] 바로 commit 하지 않고 누적기에 모아뒀다가 주기적으로 한 번에 반영
     if request.args.get('increment') == 'true':
-        notice.views += 1
-        db.session.commit()
+        view_counter.add(notice.id)
     
-    return jsonify(notice.to_dict())
+    data = notice.to_dict()
+    data['views'] = (notice.views or 0) + view_counter.pending(notice.id)  # 아직 반영 안 된 조회수 포함
+    return jsonify(data)
 
 # --- 3. 공지 등록 (POST) ---
 @notice_bp.route('', methods=['POST'])
@@ -158,4 +199,5 @@ def delete_notice(id):
 @notice_bp.route('/download/<int:notice_id>/<filename>')
 def download_file(notice_id, filename):
     target_dir = os.path.join(UPLOAD_FOLDER, str(notice_id))
-    return send_from_directory(target_dir, filename, as_attachment=True)
\ No newline at end of file
+    # [수정] 강한 ETag + Range(이어받기) 지원, UPLOAD_OFFLOAD 설정 시 앞단 웹서버가 전송
+    return uploads.send_upload(target_dir, filename, as_attachment=True)
\ No newline at end of file
@@ -0,0 +1,361 @@
+# routes/rental_routes.py
+# 물품 대여/반납 및 재고 관리 API
+from flask import Blueprint, request, jsonify, send_file
+import os
+from datetime import datetime, timedelta
+from extensions import limiter, login_required, sanitize_input, stock_store
+from services.stock_store import DEFAULT_CATEGORY, ReservationError, StockBatchError, StockConflictError
+from services.db_utils import write_transaction
+from services import rental_ledger
+from services.xlsx_utils import read_rows
+from services.file_cache import FileBackedJSON
+from config import KST, MAJOR_FILE, EXPORT_DIR
+
+rental_bp = Blueprint('rental', __name__)
+
+# [NEW] If-Match: "<재고 버전>" (GET /api/items 또는 이전 수정 응답의 version) → 없으면 None (조건 없이 반영)
+# 약한 태그(W/"7")도 같은 버전으로 취급 (프록시가 압축하면서 ETag 를 약한 태그로 바꿀 수 있음)
+def expected_stock_version():
+    if not request.if_match or request.if_match.star_tag:
+        return None
+    tags = request.if_match.as_set(include_weak=True)
+    if len(tags) != 1:
+        raise ValueError('If-Match 에는 버전 하나만 지정해주세요.')
+    try:
+        return int(tags.pop())
+    except ValueError:
+        raise ValueError('If-Match 버전 형식이 잘못되었습니다.')
+
+def stock_conflict(e):
+    return jsonify({'status': 'fail', 'message': str(e), 'version': e.version}), 412
+
+# ==========================
+# [기존] 재고 관리 API (통합됨)
+# [수정] 수정 후 재고 버전(version)을 응답, If-Match 가 있으면 버전이 같을 때만 반영
+# ==========================
+@rental_bp.route('/api/admin/stock/update', methods=['POST'])
+@login_required
+def update_stock():
+    try:
+        data = request.get_json()
+        new_items = data.get('items')
+        version = stock_store.replace(new_items, expected_version=expected_stock_version())
+        return jsonify({'status': 'success', 'version': version})
+    except StockConflictError as e:
+        return stock_conflict(e)
+    except Exception as e:
+        return jsonify({'status': 'fail', 'message': str(e)})
+
+# [NEW] 재고 여러 건 한 번에 수정 (추가/수정/삭제/수량 증감)
+# {"operations": [{"op": "add", "name": "우산", "count": 10, "category": "반납물품"},
+#                 {"op": "update", "name": "담요", "count": 3},   (count/category 중 보낸 것만 변경)
+#                 {"op": "adjust", "name": "충전기", "delta": -2},
+#                 {"op": "delete", "name": "돗자리"}]}
+# 순서대로 적용한 결과에서 바뀐 행만 한 트랜잭션으로 반영 (하나라도 잘못되면 아무것도 반영되지 않음)
+@rental_bp.route('/api/admin/stock/batch', methods=['POST'])
+@login_required
+def batch_update_stock():
+    try:
+        data = request.get_json(silent=True) or {}
+        operations = data.get('operations')
+        if not isinstance(operations, list) or not operations:
+            return jsonify({'status': 'fail', 'message': '작업 목록(operations)이 없습니다.'}), 400
+        for op in operations:
+            if isinstance(op, dict):
+                for key in ('name', 'category'):
+                    if key in op:
+                        op[key] = sanitize_input(op[key])
+
+        version, summary = stock_store.apply_batch(operations, expected_version=expected_stock_version())
+        response = jsonify({'status': 'success', 'version': version, **summary})
+        response.set_etag(str(version))
+        return response
+    except StockConflictError as e:
+        return stock_conflict(e)
+    except (StockBatchError, ValueError) as e:
+        return jsonify({'status': 'fail', 'message': str(e)}), 400
+    except Exception as e:
+        return jsonify({'status': 'error', 'message': str(e)}), 500
+
+@rental_bp.route('/api/admin/stock/add', methods=['POST'])
+@login_required
+def add_stock_item():
+    try:
+        data = request.get_json()
+        name = sanitize_input(data.get('name'))
+        count = data.get('count')
+        category = sanitize_input(data.get('category') or DEFAULT_CATEGORY)
+
+        version = stock_store.add(name, count, category)
+        return jsonify({'status': 'success', 'version': version})
+    except Exception as e:
+        return jsonify({'status': 'fail', 'message': str(e)})
+
+@rental_bp.route('/api/admin/stock/delete', methods=['POST'])
+@login_required
+def delete_stock_item():
+    try:
+        data = request.get_json()
+        name = data.get('name')
+        version = stock_store.delete(name)
+        return jsonify({'status': 'success', 'version': version})
+    except Exception as e:
+        return jsonify({'status': 'fail', 'message': str(e)})
+
+# ==========================
+# [기존] 사용자/관리자 API
+# ==========================
+@rental_bp.route('/api/items', methods=['GET'])
+def get_items():
+    try:
+        # [수정] 재고 버전도 함께 (관리자 화면이 수정 요청의 If-Match 로 사용)
+        rows, version = stock_store.snapshot()
+        return jsonify({'status': 'success', 'data': rows, 'version': version})
+    except Exception as e:
+        return jsonify({'status': 'error', 'message': str(e)}), 500
+
+# [NEW] 학과 목록 캐시: major.xlsx 가 바뀔 때만 다시 읽고, 직렬화된 JSON + ETag 로 응답
+def build_departments():
+    depts = ()
+    if os.path.exists(MAJOR_FILE):
+        depts = tuple(row['학과명'] for row in read_rows(MAJOR_FILE) if row.get('학과명') is not None)
+    return {'status': 'success', 'data': depts}
+
+# 대여 페이지 로드마다 호출되므로 브라우저도 5분간 캐시 (이후에는 ETag 로 확인)
+departments_cache = FileBackedJSON([MAJOR_FILE], build_departments, max_age=300)
+
+@rental_bp.route('/api/departments', methods=['GET'])
+def get_departments():
+    try:
+        return departments_cache.response()
+    except Exception as e:
+        return jsonify({'status': 'error', 'message': str(e)}), 500
+
+# [NEW] 학과 목록 강제 새로고침 (관리자용)
+@rental_bp.route('/api/admin/departments/reload', methods=['POST'])
+@login_required
+def reload_departments():
+    try:
+        # 파일 mtime 을 갱신해서 다른 워커 프로세스의 캐시도 함께 무효화
+        if os.path.exists(MAJOR_FILE):
+            os.utime(MAJOR_FILE)
+        departments_cache.invalidate()
+        body, etag = departments_cache.get()
+        return jsonify({'status': 'success', 'etag': etag})
+    except Exception as e:
+        return jsonify({'status': 'fail', 'message': str(e)})
+
+@rental_bp.route('/api/borrow', methods=['POST'])
+@limiter.limit("10 per minute")
+def borrow_item():
+    data = request.get_json()
+    selected_items = data.get('selected_items', []) 
+
+    new_log = {
+        '이름': sanitize_input(data.get('name')),
+        '전화번호': sanitize_input(data.get('phone')),
+        '학번': sanitize_input(data.get('student_id')),
+        '학과': sanitize_input(data.get('department')),
+        '대여물품': ", ".join(selected_items),
+        '대여담당자': '', 
+        '대여시각': datetime.now(KST).strftime('%Y-%m-%d %H:%M:%S'),
+        '대여현황': '신청',
+        '반납담당자': '',
+        '반납시각': ''
+    }
+
+    # [수정] 재고 차감 + 기록 저장을 하나의 DB 트랜잭션으로 처리
+    # 선택한 물품이 전부 차감되거나 하나도 차감되지 않음 (여러 워커 프로세스 사이에서도 보장)
+    try:
+        with write_transaction() as conn:
+            stock_store.reserve(selected_items, conn)
+            rental_ledger.append(conn, new_log)
+    except ReservationError as e:
+        return jsonify({'status': 'fail', 'message': str(e)})
+    return jsonify({'status': 'success'})
+
+@rental_bp.route('/api/check', methods=['POST'])
+def check_status():
+    data = request.get_json()
+    name = data.get('name')
+    student_id = data.get('student_id')
+    # [수정] (이름, 학번) 인덱스로 필요한 컬럼만 조회, 반납 예정일도 SQL 에서 계산 (행마다 strptime 하지 않음)
+    result_list = rental_ledger.student_history(name, student_id)
+    if not result_list:
+        return jsonify({'status': 'fail', 'message': '기록이 없습니다.'})
+    return jsonify({'status': 'success', 'data': result_list, 'user_info': {'name': name, 'student_id': student_id}})
+
+@rental_bp.route('/api/admin/dashboard', methods=['GET'])
+@login_required
+def admin_dashboard():
+    # [수정] 전체 기록을 읽지 않고 미리 집계해 둔 값(rental_stats) + 최근 5건만 조회
+    today = datetime.now(KST).strftime('%Y-%m-%d')
+    today_count = rental_ledger.get_stat('day', today)
+    recent_logs = [r.to_log_dict() for r in rental_ledger.recent(5)]
+    return jsonify({
+        'status': 'success',
+        'today_count': today_count,
+        'recent_logs': recent_logs,
+        'status_counts': rental_ledger.get_stats('status'),
+        'item_counts': rental_ledger.get_stats('item')
+    })
+
+# [NEW] 일별 대여 추이 (?days=30, 오늘 포함)
+@rental_bp.route('/api/admin/stats/daily', methods=['GET'])
+@login_required
+def daily_stats():
+    days = max(1, min(request.args.get('days', 30, type=int), 366))
+    end = datetime.now(KST).date()
+    series = rental_ledger.daily_counts(end - timedelta(days=days - 1), end)
+    return jsonify({'status': 'success', 'data': [
+        {'date': day.isoformat(), 'count': count} for day, count in series
+    ]})
+
+# [NEW] 주별 대여 추이 (?weeks=12, 이번 주 포함, 월요일 시작)
+@rental_bp.route('/api/admin/stats/weekly', methods=['GET'])
+@login_required
+def weekly_stats():
+    weeks = max(1, min(request.args.get('weeks', 12, type=int), 104))
+    today = datetime.now(KST).date()
+    start = today - timedelta(days=today.weekday(), weeks=weeks - 1)
+    totals = {}
+    for day, count in rental_ledger.daily_counts(start, today):
+        week_start = day - timedelta(days=day.weekday())
+        totals[week_start] = totals.get(week_start, 0) + count
+    return jsonify({'status': 'success', 'data': [
+        {'week_start': week.isoformat(), 'count': count} for week, count in totals.items()
+    ]})
+
+@rental_bp.route('/api/admin/requests', methods=['GET'])
+@login_required
+def get_requests():
+    # [수정] id 는 rentals 테이블의 고정 키 (행 삭제/추가로 바뀌지 않음)
+    # [수정] 응답에 필요한 컬럼만 조회해서 그대로 반환
+    return jsonify({'status': 'success', 'data': rental_ledger.status_rows('신청')})
+
+@rental_bp.route('/api/admin/approve', methods=['POST'])
+@login_required
+def approve_request():
+    data = request.get_json()
+    log_id = data.get('id')
+    handler = data.get('handler')
+    rental = rental_ledger.get_rental(log_id)
+
+    if rental:
+        items_list = rental.items.split(', ')
+        is_all_disposable = True
+        for item_name in items_list:
+            stock_row = stock_store.get(item_name)
+            if stock_row:
+                if stock_row['카테고리'] != '일회용품':
+                    is_all_disposable = False
+                    break
+            else:
+                is_all_disposable = False
+        
+        with write_transaction() as conn:
+            # '신청' 상태일 때만 반영 (다른 관리자가 먼저 처리했으면 실패)
+            if is_all_disposable:
+                done = rental_ledger.transition(
+                    conn, rental.id, '신청', 대여현황='반납완료', 대여담당자=handler,
+                    반납시각=datetime.now(KST).strftime('%Y-%m-%d %H:%M:%S')
+                )
+            else:
+                done = rental_ledger.transition(conn, rental.id, '신청', 대여현황='미반납', 대여담당자=handler)
+        if done:
+            return jsonify({'status': 'success'})
+    return jsonify({'status': 'fail'})
+
+@rental_bp.route('/api/admin/reject', methods=['POST'])
+@login_required
+def reject_request():
+    data = request.get_json()
+    log_id = data.get('id')
+    rental = rental_ledger.get_rental(log_id)
+
+    if rental:
+        with write_transaction() as conn:
+            # 기록 삭제와 재고 복구를 한 번에 (이미 처리된 요청이면 둘 다 하지 않음)
+            done = rental_ledger.delete(conn, rental.id, '신청')
+            if done:
+                stock_store.restock(rental.items.split(', '), conn)
+        if done:
+            return jsonify({'status': 'success'})
+    return jsonify({'status': 'fail'})
+
+@rental_bp.route('/api/admin/ongoing', methods=['GET'])
+@login_required
+def get_ongoing():
+    return jsonify({'status': 'success', 'data': rental_ledger.status_rows('미반납', with_phone=True)})
+
+# [NEW] 연체 목록 (반납 예정일이 지난 미반납, 오래된 순 / ?limit=N)
+@rental_bp.route('/api/admin/overdue', methods=['GET'])
+@login_required
+def get_overdue():
+    limit = request.args.get('limit', type=int)
+    today = datetime.now(KST).date()
+    data = rental_ledger.list_overdue(today, limit=max(1, limit) if limit else None)
+    return jsonify({'status': 'success', 'today': today.isoformat(), 'data': data})
+
+@rental_bp.route('/api/admin/return', methods=['POST'])
+@login_required
+def return_item():
+    data = request.get_json()
+    log_id = data.get('id')
+    handler = data.get('handler')
+    rental = rental_ledger.get_rental(log_id)
+    
+    if rental:
+        with write_transaction() as conn:
+            # '미반납' 상태일 때만 반납 처리 (중복 반납으로 재고가 두 번 늘지 않도록)
+            done = rental_ledger.transition(
+                conn, rental.id, '미반납', 대여현황='반납완료', 반납담당자=handler,
+                반납시각=datetime.now(KST).strftime('%Y-%m-%d %H:%M:%S')
+            )
+            if done:
+                # 일회용품 / 재고 -1 항목은 복구하지 않음
+                stock_store.restock(rental.items.split(', '), conn, skip_disposable=True)
+        if done:
+            return jsonify({'status': 'success'})
+    return jsonify({'status': 'fail'})
+
+@rental_bp.route('/api/admin/logs', methods=['GET'])
+@login_required
+def get_all_logs():
+    # [수정] pandas DataFrame 없이 필요한 컬럼만 최신순으로 조회 (응답 모양은 동일)
+    return jsonify({'status': 'success', 'data': rental_ledger.all_logs()})
+
+# ==========================
+# [수정] 엑셀 다운로드 API (파일명 + 시각 설정)
+# ==========================
+@rental_bp.route('/api/admin/download_log', methods=['GET'])
+@login_required
+def download_log_file():
+    # [수정] 엑셀은 DB 기록으로부터 요청 시점에 생성 (데이터가 그대로면 만들어 둔 파일 재사용)
+    # 옵션: ?start=YYYY-MM-DD&end=YYYY-MM-DD (대여시각 기준), ?status=신청|미반납|반납완료
+    start = request.args.get('start') or None
+    end = request.args.get('end') or None
+    status = request.args.get('status') or None
+    try:
+        for value in (start, end):
+            if value:
+                datetime.strptime(value, '%Y-%m-%d')
+    except ValueError:
+        return jsonify({'status': 'fail', 'message': '날짜 형식은 YYYY-MM-DD 입니다.'}), 400
+    if status and status not in ('신청', '미반납', '반납완료'):
+        return jsonify({'status': 'fail', 'message': '알 수 없는 대여현황입니다.'}), 400
+
+    path = rental_ledger.export_log(EXPORT_DIR, start, end, status)
+
+    # 1. 현재 시간(KST) 구하기
+    timestamp = datetime.now(KST).strftime('%Y%m%d_%H%M%S')
+
+    # 2. 파일명 생성 (예: 대여반납기록_20251121_123000.xlsx)
+    custom_filename = f"대여반납기록_{timestamp}.xlsx"
+
+    # 3. 파일 전송 (download_name 옵션 사용)
+    return send_file(
+        path, 
+        as_attachment=True, 
+        download_name=custom_filename
+    )
@@ -0,0 +1,120 @@
+# routes/system_routes.py
+from flask import Blueprint, request, jsonify, session, current_app, Response
+import os
+import hmac
+import json
+import time
+import threading
+from models import Schedule
+from extensions import limiter, login_required, settings_store
+from services.metrics import metrics
+
+system_bp = Blueprint('system', __name__)
+
+# [수정] 설정 파일(settings.json)은 extensions.settings_store 가 메모리에 들고 있음 (파일이 바뀌었을 때만 다시 읽음)
+
+# 눈 내리기 실시간 스트림(SSE) 설정
+# gthread 워커는 연결 하나가 스레드 하나를 계속 쓰므로 워커당 동시 스트림 수를 제한하고,
+# 일정 시간마다 연결을 끊어 브라우저가 다시 연결하게 함 (EventSource 자동 재연결)
+STREAM_TIMEOUT = int(os.getenv('SNOWFALL_STREAM_TIMEOUT', 30))      # 연결 유지 시간(초)
+STREAM_KEEPALIVE = 10                                                # 변경이 없을 때 keep-alive 주기(초)
+_stream_slots = threading.BoundedSemaphore(int(os.getenv('SNOWFALL_STREAM_MAX', 2)))  # 워커당 동시 스트림 수
+
+# [NEW] 관리자 세션 체크 API
+# 프론트엔드가 페이지 이동할 때마다 "나 아직 로그인 상태 맞아?" 하고 물어보는 용도
+@system_bp.route('/api/admin/check-session', methods=['GET'])
+def check_session():
+    if session.get('is_admin'):
+        return jsonify({'status': 'success', 'is_admin': True})
+    return jsonify({'status': 'fail', 'message': '세션 만료'}), 401
+
+# ==========================
+# [NEW] 학사일정 API (DB 사용)
+# ==========================
+@system_bp.route('/api/schedule', methods=['GET'])
+def get_schedule():
+    schedules = Schedule.query.all()
+    # 만약 DB가 비어있으면 초기 데이터 삽입 (선택사항)
+    return jsonify([s.to_dict() for s in schedules])
+
+# ==========================
+# 시스템 설정 (눈 내리기 효과)
+# ==========================
+@system_bp.route('/api/system/snowfall', methods=['GET'])
+def get_snowfall_status():
+    return jsonify({'status': 'success', 'enabled': settings_store.get('snowfall', False)})
+
+# [NEW] 눈 내리기 상태 실시간 스트림 (Server-Sent Events)
+# 연결하면 현재 상태를 한 번 보내고, 관리자가 바꿀 때마다 이벤트 전송
+# 동시 연결이 많아 자리가 없으면 503 → 클라이언트는 GET /api/system/snowfall 폴링으로 대체
+@system_bp.route('/api/system/snowfall/stream', methods=['GET'])
+@limiter.exempt  # 재연결마다 요청 횟수 제한에 걸리지 않도록 (동시 연결 수로 제한)
+def stream_snowfall_status():
+    if not _stream_slots.acquire(blocking=False):
+        return jsonify({'status': 'fail', 'message': '잠시 후 다시 시도해주세요.'}), 503
+
+    def events():
+        settings, version = settings_store.snapshot()
+        yield f"retry: 3000\ndata: {json.dumps({'enabled': settings.get('snowfall', False)})}\n\n"
+        deadline = time.monotonic() + STREAM_TIMEOUT
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            changed = settings_store.wait_for_change(version, timeout=min(STREAM_KEEPALIVE, remaining))
+            if changed is None:
+                yield ": keep-alive\n\n"
+                continue
+            settings, version = changed
+            yield f"data: {json.dumps({'enabled': settings.get('snowfall', False)})}\n\n"
+
+    response = Response(events(), mimetype='text/event-stream', headers={
+        'Cache-Control': 'no-cache',
+        'X-Accel-Buffering': 'no'  # nginx 가 모아서 보내지 않도록
+    })
+    response.call_on_close(_stream_slots.release)  # 연결이 끝나면(중간에 끊겨도) 자리 반납
+    return response
+
+@system_bp.route('/api/admin/system/snowfall', methods=['POST'])
+@login_required
+def set_snowfall_status():
+    data = request.get_json()
+    enabled = data.get('enabled', False)
+    
+    # [수정] 다른 설정을 덮어쓰지 않도록 잠금 안에서 변경분만 반영, 임시 파일 + rename 으로 저장
+    settings_store.update(snowfall=enabled)
+    
+    return jsonify({'status': 'success', 'enabled': enabled})
+
+# ==========================
+# [NEW] 계측 지표 (Prometheus 텍스트 형식, 모든 워커 합산)
+# 관리자 세션 또는 Authorization: Bearer <METRICS_TOKEN> (수집기용)
+# ==========================
+@system_bp.route('/api/admin/metrics', methods=['GET'])
+@limiter.exempt  # 수집 주기(예: 15초)가 기본 요청 제한보다 잦음
+def get_metrics():
+    token = current_app.config.get('METRICS_TOKEN')
+    authorized = session.get('is_admin') or (
+        token and hmac.compare_digest(request.headers.get('Authorization', ''), f'Bearer {token}'))
+    if not authorized:
+        return jsonify({'status': 'fail', 'message': '로그인이 필요합니다.'}), 401
+    return Response(metrics.render_prometheus(), mimetype='text/plain; version=0.0.4')
+
+# ==========================
+# 관리자 로그인/로그아웃
+# ==========================
+@system_bp.route('/api/admin/login', methods=['POST'])
+def admin_login():
+    data = request.get_json()
+    if data.get('password') == current_app.config['ADMIN_PASSWORD']:
+        session['is_admin'] = True
+        return jsonify({'status': 'success'})
+    else:
+        return jsonify({'status': 'fail', 'message': '비밀번호 불일치'}), 401
+    
+# [NEW] 관리자 로그아웃 API
+@system_bp.route('/api/admin/logout', methods=['POST'])
+def admin_logout():
+    # 세션에서 관리자 권한 제거
+    session.pop('is_admin', None)
+    return jsonify({'status': 'success', 'message': '로그아웃 되었습니다.'})
@@ -0,0 +1,88 @@
+# routes/teaser_routes.py
+from flask import Blueprint, request, jsonify, Response, stream_with_context
+from datetime import datetime
+from extensions import limiter, login_required, sanitize_input, teaser_writer
+from services import teaser_entries
+from services.teaser_entries import DuplicateEntryError
+from config import KST
+
+teaser_bp = Blueprint('teaser', __name__)
+
+# ==========================
+# [신규] 티저 이벤트 API
+# [수정] CSV 파일 대신 teaser_entries 테이블에 저장 (기존 CSV 는 서버 시작 시 한 번 이관)
+# ==========================
+@teaser_bp.route('/api/teaser/entry', methods=['POST'])
+@limiter.limit("5 per minute")
+def teaser_entry():
+    try:
+        data = request.get_json()
+        name = sanitize_input(data.get('name'))
+        student_id = sanitize_input(data.get('student_id'))
+        dept = sanitize_input(data.get('department'))
+        phone = sanitize_input(data.get('phone'))
+        agreed = data.get('agreed')
+
+        if not all([name, student_id, dept, phone, agreed]):
+            return jsonify({'status': 'fail', 'message': '모든 정보를 입력해주세요.'}), 400
+
+        entry_time = datetime.now(KST).strftime('%Y-%m-%d %H:%M:%S')
+        # [수정] 저장기에 넘기고 묶음 저장이 끝날 때까지 대기 (같은 학번은 한 번만)
+        teaser_writer.add(entry_time, name, student_id, dept, phone, agreed)
+
+        return jsonify({'status': 'success', 'message': '응모 완료'})
+    except DuplicateEntryError as e:
+        return jsonify({'status': 'fail', 'message': str(e)}), 400
+    except Exception as e:
+        return jsonify({'status': 'error', 'message': str(e)}), 500
+        
+# 2. [신규] 티저 응모 목록 조회 (관리자용)
+# [수정] ?page=1&per_page=50&q=검색어 로 페이지 단위 조회 (파라미터가 없으면 기존처럼 전체 목록)
+# [NEW] &field=student_id|entered_at 이면 그 항목 앞부분 일치 (인덱스 조회)
+@teaser_bp.route('/api/admin/teaser', methods=['GET'])
+@login_required
+def get_teaser_entries():
+    try:
+        q = request.args.get('q', '').strip()
+        query = teaser_entries.search(q, request.args.get('field'))
+
+        if not any(key in request.args for key in ('page', 'per_page', 'q')):
+            return jsonify({'status': 'success', 'data': [e.to_csv_dict() for e in query]})
+
+        page = max(1, request.args.get('page', 1, type=int))
+        per_page = max(1, min(request.args.get('per_page', 50, type=int), 500))
+        entries = query.offset((page - 1) * per_page).limit(per_page).all()
+        return jsonify({
+            'status': 'success',
+            'data': [e.to_csv_dict() for e in entries],
+            'total': query.order_by(None).count(),
+            'page': page,
+            'per_page': per_page
+        })
+    except ValueError as e:
+        return jsonify({'status': 'fail', 'message': str(e)}), 400
+    except Exception as e:
+        return jsonify({'status': 'error', 'message': str(e)}), 500
+
+# 3. [NEW] 티저 응모 목록 다운로드 (관리자용, ?format=csv|xlsx&q=검색어&field=)
+@teaser_bp.route('/api/admin/teaser/download', methods=['GET'])
+@login_required
+def download_teaser_entries():
+    fmt = request.args.get('format', 'csv')
+    if fmt not in ('csv', 'xlsx'):
+        return jsonify({'status': 'fail', 'message': '지원하지 않는 형식입니다.'}), 400
+
+    try:
+        query = teaser_entries.search(request.args.get('q', '').strip(), request.args.get('field'))
+    except ValueError as e:
+        return jsonify({'status': 'fail', 'message': str(e)}), 400
+    filename = f"teaser_entries_{datetime.now(KST).strftime('%Y%m%d')}.{fmt}"
+    if fmt == 'csv':
+        body, mimetype = teaser_entries.iter_csv(query), 'text/csv; charset=utf-8'
+    else:
+        body, mimetype = teaser_entries.iter_xlsx(query), \
+            'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+
+    # 응답을 보내는 동안 DB 를 조금씩 읽으므로 요청 컨텍스트 유지
+    return Response(stream_with_context(body), mimetype=mimetype,
+                    headers={'Content-Disposition': f'attachment; filename={filename}'})
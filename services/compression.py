@@ -0,0 +1,69 @@
+# services/compression.py
+# JSON/텍스트 응답 압축 (Accept-Encoding 에 따라 br 또는 gzip)
+# - 작은 응답(COMPRESS_MIN_SIZE 바이트 미만)은 압축 이득보다 CPU 비용이 커서 그대로 보냄
+# - 파일 전송(send_file)과 스트리밍 응답은 건드리지 않음
+# - 캐시되는 응답(FileBackedJSON)은 압축본도 같이 보관해서 매번 다시 압축하지 않음
+import gzip
+from flask import current_app, request
+
+try:
+    import brotli  # 설치되어 있으면 br 우선 사용 (pip install brotli)
+except ImportError:
+    brotli = None
+
+COMPRESSIBLE_TYPES = ('application/json', 'application/javascript', 'text/')
+
+
+def choose_encoding():
+    # 클라이언트가 받을 수 있는 인코딩 중 가장 좋은 것 (없으면 None)
+    accept = request.accept_encodings
+    if brotli is not None and accept['br']:
+        return 'br'
+    if accept['gzip']:
+        return 'gzip'
+    return None
+
+
+def compress(body, encoding):
+    level = current_app.config['COMPRESS_LEVEL']
+    if encoding == 'br':
+        return brotli.compress(body, quality=min(level, 11))
+    return gzip.compress(body, compresslevel=level, mtime=0)  # mtime=0: 같은 입력이면 같은 결과
+
+
+def is_compressible(response):
+    return (response.mimetype or '').startswith(COMPRESSIBLE_TYPES)
+
+
+def add_vary(response):
+    response.vary.add('Accept-Encoding')
+
+
+def compress_response(response):
+    if not is_compressible(response):
+        return response
+    add_vary(response)
+    if (response.status_code != 200 or response.direct_passthrough or response.is_streamed
+            or 'Content-Encoding' in response.headers):
+        return response
+
+    body = response.get_data()
+    if len(body) < current_app.config['COMPRESS_MIN_SIZE']:
+        return response
+    encoding = choose_encoding()
+    if encoding is None:
+        return response
+
+    response.set_data(compress(body, encoding))
+    response.headers['Content-Encoding'] = encoding
+    # 압축본은 다른 표현이므로 ETag 도 구분
+    etag, weak = response.get_etag()
+    if etag:
+        response.set_etag(f'{etag}-{encoding}', weak)
+    return response
+
+
+def init_app(app):
+    app.config.setdefault('COMPRESS_MIN_SIZE', 1024)
+    app.config.setdefault('COMPRESS_LEVEL', 6)
+    app.after_request(compress_response)
@@ -0,0 +1,59 @@
+# services/db_utils.py
+# 여러 워커 프로세스가 같은 SQLite 파일을 쓸 때 필요한 공용 헬퍼
+from contextlib import contextmanager
+from sqlalchemy import event, text
+from models import db
+
+
+def apply_sqlite_pragmas(engine, pragmas):
+    # 새 연결이 만들어질 때마다 PRAGMA 적용 (워커/스레드마다 연결이 따로라서 연결 단위 설정이 필요)
+    pragmas = {name: value for name, value in pragmas.items() if value not in (None, '')}
+    if engine.dialect.name != 'sqlite' or not pragmas:
+        return
+
+    @event.listens_for(engine, 'connect')
+    def _set_pragmas(dbapi_conn, connection_record):
+        cursor = dbapi_conn.cursor()
+        try:
+            for name, value in pragmas.items():
+                cursor.execute(f'PRAGMA {name}={value}')
+        finally:
+            cursor.close()
+
+
+@contextmanager
+def write_transaction():
+    # BEGIN IMMEDIATE: 시작하자마자 쓰기 잠금을 잡음
+    # → 다른 프로세스와 '읽고 나서 쓰기' 사이에 끼어들 틈이 없음 (재고 차감/상태 변경을 원자적으로 처리)
+    with db.engine.connect() as conn:
+        conn.exec_driver_sql('BEGIN IMMEDIATE')
+        try:
+            yield conn
+        except Exception:
+            conn.rollback()
+            raise
+        conn.commit()
+
+
+def get_version(conn, name):
+    row = conn.execute(
+        text('SELECT version, file_mtime FROM store_versions WHERE name = :name'),
+        {'name': name}
+    ).first()
+    return (row[0], row[1]) if row else (0, None)
+
+
+def bump_version(conn, name):
+    # 데이터가 바뀔 때마다 +1 (다른 워커는 이 값이 바뀌면 캐시를 다시 읽음)
+    conn.execute(text(
+        'INSERT INTO store_versions (name, version) VALUES (:name, 1) '
+        'ON CONFLICT(name) DO UPDATE SET version = version + 1'
+    ), {'name': name})
+    return get_version(conn, name)[0]
+
+
+def set_file_mtime(conn, name, mtime):
+    conn.execute(text(
+        'INSERT INTO store_versions (name, version, file_mtime) VALUES (:name, 0, :mtime) '
+        'ON CONFLICT(name) DO UPDATE SET file_mtime = :mtime'
+    ), {'name': name, 'mtime': mtime})
@@ -0,0 +1,81 @@
+# services/file_cache.py
+# 데이터 파일(엑셀 등)로 만든 JSON 응답을 미리 직렬화해서 들고 있는 캐시
+# - 파일 mtime 이 바뀌었을 때만 다시 만듦 (요청마다 파일 파싱 X, os.stat 만)
+# - 응답 본문의 해시를 ETag 로 사용 → If-None-Match 가 같으면 304 (본문 전송 X)
+# - gzip/br 압축본도 인코딩별로 한 번만 만들어 보관
+import os
+import hashlib
+import threading
+from flask import Response, current_app, request
+from services.compression import choose_encoding, compress, add_vary
+
+
+class FileBackedJSON:
+    def __init__(self, paths, build, max_age=0):
+        # 변경 감지 대상 파일들 (목록, 또는 목록을 돌려주는 함수 → 만든 결과에 따라 대상이 바뀌는 경우)
+        self.paths = paths if callable(paths) else list(paths)
+        self.build = build         # 파일을 읽어서 응답 객체(dict/list)를 만드는 함수
+        self.max_age = max_age     # 브라우저 캐시 시간(초), 0 이면 매번 ETag 로 확인
+
+        self._lock = threading.Lock()
+        self._mtimes = None
+        self._body = None
+        self._etag = None
+        self._encoded = {}  # 인코딩 -> 압축된 본문
+
+    def _current_mtimes(self):
+        mtimes = []
+        paths = self.paths() if callable(self.paths) else self.paths
+        for path in paths:
+            try:
+                mtimes.append(os.stat(path).st_mtime_ns)
+            except FileNotFoundError:
+                mtimes.append(None)
+        return tuple(mtimes)
+
+    def invalidate(self):
+        with self._lock:
+            self._mtimes = None
+
+    def get(self):
+        # (JSON bytes, ETag) 반환. 파일이 그대로면 캐시 사용
+        mtimes = self._current_mtimes()
+        with self._lock:
+            if mtimes != self._mtimes:
+                payload = self.build()
+                # jsonify 와 같은 직렬화 규칙(app.json) 사용
+                self._body = current_app.json.dumps(payload).encode('utf-8')
+                self._etag = hashlib.sha1(self._body).hexdigest()
+                self._encoded = {}
+                # 감지 대상이 build 결과로 정해지는 경우 새 목록 기준으로 다시 기록
+                self._mtimes = self._current_mtimes() if callable(self.paths) else mtimes
+            return self._body, self._etag
+
+    def _compressed(self, body, etag, encoding):
+        # 압축본 (같은 본문이면 처음 만든 것을 재사용)
+        with self._lock:
+            if etag != self._etag:  # 그 사이 다시 만들어졌으면 보관하지 않음
+                return compress(body, encoding)
+            if encoding not in self._encoded:
+                self._encoded[encoding] = compress(body, encoding)
+            return self._encoded[encoding]
+
+    def response(self):
+        body, etag = self.get()
+        encoding = None
+        if len(body) >= current_app.config.get('COMPRESS_MIN_SIZE', 1024):
+            encoding = choose_encoding()
+        if encoding:
+            body, etag = self._compressed(body, etag, encoding), f'{etag}-{encoding}'
+        resp = Response(body, mimetype='application/json')
+        if encoding:
+            resp.headers['Content-Encoding'] = encoding
+        add_vary(resp)
+        resp.set_etag(etag)
+        if self.max_age:
+            resp.cache_control.public = True
+            resp.cache_control.max_age = self.max_age
+        else:
+            resp.cache_control.no_cache = True
+        # If-None-Match 가 현재 ETag 와 같으면 304 로 바꿔줌
+        return resp.make_conditional(request)
@@ -0,0 +1,171 @@
+# services/limiter_storage.py
+# Flask-Limiter 용 SQLite 저장소 (storage_uri="sqlite:///data/limiter.db")
+# - memory:// 는 워커 프로세스마다 카운터가 따로라서 워커 N개면 제한도 N배로 느슨해짐
+# - 별도 서버(Redis 등) 없이 같은 서버의 모든 워커가 하나의 파일로 제한을 공유
+# - 기록이 날아가도 문제없는 데이터이므로 WAL + synchronous=OFF 로 가볍게 사용
+import os
+import sqlite3
+import threading
+import time
+from limits.storage import Storage, MovingWindowSupport
+
+# 오래된 기록 정리 주기 (쓰기 N번마다 한 번)
+CLEANUP_EVERY = 500
+
+SCHEMA = '''
+CREATE TABLE IF NOT EXISTS counters (
+    key TEXT PRIMARY KEY,
+    value INTEGER NOT NULL,
+    expiry REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS events (
+    key TEXT NOT NULL,
+    atime REAL NOT NULL,
+    expires REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS ix_events_key_atime ON events (key, atime);
+'''
+# 기록마다 만료 시각(atime + 그 제한의 기간)을 저장 → 정리 시 워커마다 다른 값(본 적 있는 제한 기간)에 기대지 않음
+EVENTS_INDEXES = 'CREATE INDEX IF NOT EXISTS ix_events_expires ON events (expires);'
+# 예전 파일(expires 컬럼 없음): 기존 기록은 가장 긴 기본 제한(1일)만큼 남겨둠
+LEGACY_EVENT_EXPIRY = 24 * 60 * 60
+
+
+class SQLiteStorage(Storage, MovingWindowSupport):
+    # "sqlite:///상대경로" 또는 "sqlite:////절대경로"
+    STORAGE_SCHEME = ['sqlite']
+
+    def __init__(self, uri=None, wrap_exceptions=False, **options):
+        super().__init__(uri, wrap_exceptions=wrap_exceptions, **options)
+        self.path = uri[len('sqlite:///'):] if uri else os.path.join('data', 'limiter.db')
+        self.busy_timeout = int(options.get('busy_timeout', 5000))
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._local = threading.local()
+        self._writes = 0
+        self._init_schema(self._conn())
+
+    @property
+    def base_exceptions(self):
+        return sqlite3.Error
+
+    # --- 연결 관리 ---
+    def _conn(self):
+        # 스레드마다 연결 하나, fork 된 워커에서는 새로 연결
+        conn = getattr(self._local, 'conn', None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.path, isolation_level=None, check_same_thread=False)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=OFF')
+            conn.execute(f'PRAGMA busy_timeout={self.busy_timeout}')
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def _init_schema(self, conn):
+        conn.executescript(SCHEMA)
+        columns = {row[1] for row in conn.execute('PRAGMA table_info(events)')}
+        if 'expires' not in columns:
+            conn.execute('ALTER TABLE events ADD COLUMN expires REAL NOT NULL DEFAULT 0')
+            conn.execute('UPDATE events SET expires = atime + ?', (LEGACY_EVENT_EXPIRY,))
+        conn.executescript(EVENTS_INDEXES)
+
+    def _transaction(self):
+        return _Transaction(self._conn())
+
+    def _after_write(self, conn, now):
+        self._writes += 1
+        if self._writes % CLEANUP_EVERY == 0:
+            conn.execute('DELETE FROM counters WHERE expiry <= ?', (now,))
+            conn.execute('DELETE FROM events WHERE expires <= ?', (now,))
+
+    # --- fixed-window ---
+    def incr(self, key, expiry, amount=1):
+        now = time.time()
+        with self._transaction() as conn:
+            conn.execute('''
+                INSERT INTO counters (key, value, expiry) VALUES (?, ?, ?)
+                ON CONFLICT(key) DO UPDATE SET
+                    value = CASE WHEN counters.expiry <= ? THEN excluded.value
+                                 ELSE counters.value + excluded.value END,
+                    expiry = CASE WHEN counters.expiry <= ? THEN excluded.expiry
+                                  ELSE counters.expiry END
+            ''', (key, amount, now + expiry, now, now))
+            value = conn.execute('SELECT value FROM counters WHERE key = ?', (key,)).fetchone()[0]
+            self._after_write(conn, now)
+        return value
+
+    def get(self, key):
+        row = self._conn().execute(
+            'SELECT value FROM counters WHERE key = ? AND expiry > ?', (key, time.time())
+        ).fetchone()
+        return row[0] if row else 0
+
+    def get_expiry(self, key):
+        now = time.time()
+        row = self._conn().execute(
+            'SELECT expiry FROM counters WHERE key = ? AND expiry > ?', (key, now)
+        ).fetchone()
+        return row[0] if row else now
+
+    # --- moving-window ---
+    def acquire_entry(self, key, limit, expiry, amount=1):
+        if amount > limit:
+            return False
+        now = time.time()
+        with self._transaction() as conn:
+            count = conn.execute(
+                'SELECT COUNT(*) FROM events WHERE key = ? AND atime >= ?', (key, now - expiry)
+            ).fetchone()[0]
+            if count + amount > limit:
+                return False
+            conn.executemany('INSERT INTO events (key, atime, expires) VALUES (?, ?, ?)',
+                             [(key, now, now + expiry)] * amount)
+            self._after_write(conn, now)
+        return True
+
+    def get_moving_window(self, key, limit, expiry):
+        now = time.time()
+        oldest, count = self._conn().execute(
+            'SELECT MIN(atime), COUNT(*) FROM events WHERE key = ? AND atime >= ?', (key, now - expiry)
+        ).fetchone()
+        if not count:
+            return now, 0
+        return oldest, count
+
+    # --- 관리 ---
+    def check(self):
+        try:
+            self._conn().execute('SELECT 1').fetchone()
+            return True
+        except sqlite3.Error:
+            return False
+
+    def reset(self):
+        with self._transaction() as conn:
+            removed = conn.execute('SELECT COUNT(*) FROM counters').fetchone()[0]
+            removed += conn.execute('SELECT COUNT(DISTINCT key) FROM events').fetchone()[0]
+            conn.execute('DELETE FROM counters')
+            conn.execute('DELETE FROM events')
+        return removed
+
+    def clear(self, key):
+        with self._transaction() as conn:
+            conn.execute('DELETE FROM counters WHERE key = ?', (key,))
+            conn.execute('DELETE FROM events WHERE key = ?', (key,))
+
+
+class _Transaction:
+    # BEGIN IMMEDIATE ~ COMMIT (예외 시 ROLLBACK)
+    def __init__(self, conn):
+        self.conn = conn
+
+    def __enter__(self):
+        self.conn.execute('BEGIN IMMEDIATE')
+        return self.conn
+
+    def __exit__(self, exc_type, exc, tb):
+        self.conn.execute('ROLLBACK' if exc_type else 'COMMIT')
+        return False
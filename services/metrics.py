@@ -0,0 +1,326 @@
+# services/metrics.py
+# 요청/구간별 소요 시간 계측
+# - 엔드포인트별 응답 시간 히스토그램 (method, endpoint, status)
+# - 구간(stage) 타이머: DB 쿼리(자동), JSON 직렬화(자동), 엑셀 읽기/쓰기 등 (metrics.stage('이름') 으로 감싼 곳)
+# - 응답마다 Server-Timing 헤더 (브라우저 개발자도구 Network → Timing 에서 확인)
+# - 워커 프로세스마다 따로 모으므로 METRICS_DIR 에 주기적으로 스냅샷을 쓰고, 조회 시 합쳐서 보여줌
+# - 요청 단위 프로파일링 (PROFILE_REQUESTS=1 일 때만, 관리자가 ?_profile=1 로 요청)
+# - 서버 시작 단계별 소요 시간 (import, init_db, warm_up, 워커 부팅)
+import os
+import json
+import time
+import threading
+from contextlib import contextmanager
+from functools import wraps
+from flask import current_app, g, request, session, has_request_context
+from flask.json.provider import DefaultJSONProvider
+from sqlalchemy import event
+from models import db
+from services.worker_utils import BackgroundThread, atomic_write, file_lock
+
+try:
+    from pyinstrument import Profiler as PyinstrumentProfiler  # 설치되어 있으면 ?_profile=pyinstrument 사용 가능
+except ImportError:
+    PyinstrumentProfiler = None
+
+# 히스토그램 구간 경계(초), 마지막은 +Inf
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+KEY_SEP = '|'
+DEAD_FILE = 'dead-workers.json'  # 종료된 워커들의 누적값
+
+
+def _new_histogram():
+    return {'buckets': [0] * (len(BUCKETS) + 1), 'sum': 0.0, 'count': 0}
+
+
+def _observe(hist, seconds):
+    for i, bound in enumerate(BUCKETS):
+        if seconds <= bound:
+            break
+    else:
+        i = len(BUCKETS)
+    hist['buckets'][i] += 1
+    hist['sum'] += seconds
+    hist['count'] += 1
+
+
+def _merge_into(target, snapshot):
+    for family in ('requests', 'stages'):
+        dest = target.setdefault(family, {})
+        for key, hist in snapshot.get(family, {}).items():
+            merged = dest.setdefault(key, _new_histogram())
+            merged['buckets'] = [a + b for a, b in zip(merged['buckets'], hist['buckets'])]
+            merged['sum'] += hist['sum']
+            merged['count'] += hist['count']
+    return target
+
+
+def _label_value(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _render_histogram(lines, name, labels, hist):
+    label_text = ','.join(f'{k}="{_label_value(v)}"' for k, v in labels)
+    prefix = label_text + ',' if label_text else ''
+    cumulative = 0
+    for bound, count in zip(BUCKETS + ('+Inf',), hist['buckets']):
+        cumulative += count
+        lines.append(f'{name}_bucket{{{prefix}le="{bound}"}} {cumulative}')
+    lines.append(f'{name}_sum{{{label_text}}} {hist["sum"]:.6f}')
+    lines.append(f'{name}_count{{{label_text}}} {hist["count"]}')
+
+
+def _write_json(path, data):
+    with atomic_write(path, prefix='.metrics-') as f:
+        json.dump(data, f)
+
+
+def _read_json(path):
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (FileNotFoundError, ValueError):
+        return {}
+
+
+def _pid_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+class TimedJSONProvider(DefaultJSONProvider):
+    # jsonify() 직렬화 시간을 'json' 구간으로 기록
+    def dumps(self, obj, **kwargs):
+        with metrics.stage('json'):
+            return super().dumps(obj, **kwargs)
+
+
+class Metrics:
+    def __init__(self):
+        self.directory = ''          # 워커별 스냅샷을 쓰는 폴더 ('' 이면 프로세스 안에서만 집계)
+        self.flush_interval = 15.0   # 스냅샷 저장 간격(초)
+        self.server_timing = False   # True 면 모든 응답에 Server-Timing (관리자 세션에는 항상)
+        self.profile_dir = ''        # 프로파일 결과 저장 폴더 ('' 이면 프로파일링 꺼짐)
+
+        self._lock = threading.Lock()
+        self._requests = {}   # 'GET|rental.borrow_item|200' -> histogram
+        self._stages = {}     # 'db' -> histogram
+        self.startup = {}     # 시작 단계 -> 초 (마스터에서 잰 값은 fork 된 워커도 그대로 가짐)
+        self._writer = BackgroundThread(self.flush, name='metrics-writer', interval=self.flush_interval)
+        self._profile_lock = threading.Lock()  # 프로파일러는 한 번에 하나만
+
+    def init_app(self, app):
+        self.directory = app.config.get('METRICS_DIR', '')
+        self.flush_interval = app.config.get('METRICS_FLUSH_INTERVAL', 15.0)
+        self._writer.interval = self.flush_interval
+        self.server_timing = app.config.get('SERVER_TIMING', False)
+        self.profile_dir = app.config.get('PROFILE_DIR', '')
+
+        app.json = TimedJSONProvider(app)
+        with app.app_context():
+            event.listen(db.engine, 'before_cursor_execute', self._before_cursor_execute)
+            event.listen(db.engine, 'after_cursor_execute', self._after_cursor_execute)
+        # 다른 after_request(압축 등)보다 먼저 등록 → 가장 마지막에 실행되어 그 시간까지 포함
+        app.before_request(self._start_request)
+        app.after_request(self._finish_request)
+
+    # --- 기록 ---
+    def observe_stage(self, name, seconds):
+        with self._lock:
+            _observe(self._stages.setdefault(name, _new_histogram()), seconds)
+        if has_request_context():
+            timings = g.setdefault('_stage_timings', {})
+            total, count = timings.get(name, (0.0, 0))
+            timings[name] = (total + seconds, count + 1)
+
+    def observe_request(self, method, endpoint, status, seconds):
+        key = KEY_SEP.join((method, endpoint, str(status)))
+        with self._lock:
+            _observe(self._requests.setdefault(key, _new_histogram()), seconds)
+        if self.directory:
+            self._writer.ensure_started()
+
+    def record_startup(self, phase, seconds):
+        self.startup[phase] = seconds
+        print(f"[startup] {phase}: {seconds * 1000:.1f}ms (pid {os.getpid()})")
+
+    @contextmanager
+    def stage(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe_stage(name, time.perf_counter() - start)
+
+    def timed(self, name):
+        # 함수 전체를 구간으로 기록하는 데코레이터
+        def decorator(f):
+            @wraps(f)
+            def wrapper(*args, **kwargs):
+                with self.stage(name):
+                    return f(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    # --- DB 쿼리 (SQLAlchemy 이벤트) ---
+    def _before_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault('_query_start', []).append(time.perf_counter())
+
+    def _after_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        starts = conn.info.get('_query_start')
+        if starts:
+            self.observe_stage('db', time.perf_counter() - starts.pop())
+
+    # --- 요청 훅 ---
+    def _start_request(self):
+        g._request_start = time.perf_counter()
+        # 세션 쿠키가 있을 때만 세션을 읽음 (읽기만 해도 응답에 Vary: Cookie 가 붙어 공개 캐시가 깨짐)
+        g._metrics_admin = (current_app.config['SESSION_COOKIE_NAME'] in request.cookies
+                            and bool(session.get('is_admin')))
+        if self.profile_dir and request.args.get('_profile') and g._metrics_admin:
+            self._start_profile(request.args.get('_profile'))
+
+    def _finish_request(self, response):
+        start = g.pop('_request_start', None)
+        if start is None:
+            return response
+        elapsed = time.perf_counter() - start
+        endpoint = request.endpoint or 'unmatched'  # 404 는 URL 별로 나누지 않음 (라벨 수 폭증 방지)
+        self.observe_request(request.method, endpoint, response.status_code, elapsed)
+
+        if g.get('_profiler') is not None:
+            response.headers['X-Profile'] = self._finish_profile(endpoint)
+        if self.server_timing or g.pop('_metrics_admin', False):
+            response.headers['Server-Timing'] = self._server_timing(elapsed)
+        return response
+
+    def _server_timing(self, elapsed):
+        parts = []
+        for name, (total, count) in sorted(g.get('_stage_timings', {}).items()):
+            parts.append(f'{name};dur={total * 1000:.2f};desc="{count}x"')
+        parts.append(f'total;dur={elapsed * 1000:.2f}')
+        return ', '.join(parts)
+
+    # --- 프로파일링 (요청 하나) ---
+    def _start_profile(self, kind):
+        if not self._profile_lock.acquire(blocking=False):
+            return  # 다른 요청을 프로파일링 중이면 건너뜀
+        if kind == 'pyinstrument' and PyinstrumentProfiler is not None:
+            profiler = PyinstrumentProfiler()
+        else:
+            import cProfile
+            profiler = cProfile.Profile()
+            kind = 'cprofile'
+        g._profiler = (kind, profiler)
+        if kind == 'pyinstrument':
+            profiler.start()
+        else:
+            profiler.enable()
+
+    def _finish_profile(self, endpoint):
+        kind, profiler = g.pop('_profiler')
+        try:
+            os.makedirs(self.profile_dir, exist_ok=True)
+            stamp = time.strftime('%Y%m%d-%H%M%S')
+            if kind == 'pyinstrument':
+                profiler.stop()
+                filename = f'{endpoint}-{stamp}-{os.getpid()}.html'
+                with open(os.path.join(self.profile_dir, filename), 'w', encoding='utf-8') as f:
+                    f.write(profiler.output_html())
+            else:
+                profiler.disable()
+                filename = f'{endpoint}-{stamp}-{os.getpid()}.prof'  # python -m pstats <파일> 로 확인
+                profiler.dump_stats(os.path.join(self.profile_dir, filename))
+            return filename
+        finally:
+            self._profile_lock.release()
+
+    # --- 스냅샷 / 워커 간 합산 ---
+    def snapshot(self):
+        with self._lock:
+            return {
+                'requests': {k: dict(v, buckets=list(v['buckets'])) for k, v in self._requests.items()},
+                'stages': {k: dict(v, buckets=list(v['buckets'])) for k, v in self._stages.items()},
+            }
+
+    def _worker_path(self, pid):
+        return os.path.join(self.directory, f'worker-{pid}.json')
+
+    def flush(self):
+        if not self.directory:
+            return
+        snapshot = self.snapshot()
+        if not snapshot['requests'] and not snapshot['stages']:
+            return
+        os.makedirs(self.directory, exist_ok=True)
+        _write_json(self._worker_path(os.getpid()), snapshot)
+
+    def collect(self):
+        # 모든 워커의 값을 합친 스냅샷 (종료된 워커의 파일은 dead-workers.json 에 합쳐서 정리)
+        if not self.directory:
+            return self.snapshot()
+        self.flush()
+        os.makedirs(self.directory, exist_ok=True)
+        with file_lock(os.path.join(self.directory, '.lock')):
+            dead_path = os.path.join(self.directory, DEAD_FILE)
+            dead = _read_json(dead_path)
+            total = _merge_into({}, dead)
+            reaped = []
+            for name in os.listdir(self.directory):
+                if not (name.startswith('worker-') and name.endswith('.json')):
+                    continue
+                path = os.path.join(self.directory, name)
+                data = _read_json(path)
+                pid = int(name[len('worker-'):-len('.json')])
+                if pid != os.getpid() and not _pid_alive(pid):
+                    _merge_into(dead, data)
+                    reaped.append(path)
+                _merge_into(total, data)
+            if reaped:
+                _write_json(dead_path, dead)
+                for path in reaped:
+                    os.remove(path)
+        if os.path.exists(self._worker_path(os.getpid())):
+            return total
+        return _merge_into(total, self.snapshot())
+
+    def clear_shared(self):
+        # 서버 시작 시(gunicorn 마스터) 이전 실행의 누적값 정리 → 카운터는 재시작 시 0 부터
+        if not self.directory or not os.path.isdir(self.directory):
+            return
+        for name in os.listdir(self.directory):
+            if name.endswith('.json'):
+                os.remove(os.path.join(self.directory, name))
+
+    def render_prometheus(self):
+        data = self.collect()
+        lines = [
+            '# HELP http_request_duration_seconds Request latency by endpoint.',
+            '# TYPE http_request_duration_seconds histogram',
+        ]
+        for key, hist in sorted(data.get('requests', {}).items()):
+            method, endpoint, status = key.split(KEY_SEP)
+            _render_histogram(lines, 'http_request_duration_seconds',
+                              (('method', method), ('endpoint', endpoint), ('status', status)), hist)
+        lines += [
+            '# HELP app_stage_duration_seconds Time spent in instrumented stages (db, json, excel, ...).',
+            '# TYPE app_stage_duration_seconds histogram',
+        ]
+        for name, hist in sorted(data.get('stages', {}).items()):
+            _render_histogram(lines, 'app_stage_duration_seconds', (('stage', name),), hist)
+        lines += [
+            '# HELP app_startup_seconds Time spent in each startup phase (worker that served this scrape).',
+            '# TYPE app_startup_seconds gauge',
+        ]
+        for phase, seconds in sorted(self.startup.items()):
+            lines.append(f'app_startup_seconds{{phase="{_label_value(phase)}"}} {seconds:.6f}')
+        return '\n'.join(lines) + '\n'
+
+
+# 모듈 하나에 하나만 (services/* 에서도 extensions 를 거치지 않고 구간 기록 가능)
+metrics = Metrics()
@@ -0,0 +1,59 @@
+# services/overdue_sweeper.py
+# 연체(반납 예정일이 지난 미반납) 목록을 주기적으로 파일로 저장하는 백그라운드 작업
+# - 워커가 여러 개여도 파일 잠금(flock)을 잡은 프로세스 하나만 실행 (그 워커가 종료되면 다른 워커가 이어받음)
+# - 조회는 (대여현황, 대여시각) 인덱스 범위 조회라 전체 기록이 늘어도 비용은 연체 건수만큼
+import json
+import time
+from datetime import datetime
+from config import KST
+from services import rental_ledger
+from services.worker_utils import BackgroundThread, atomic_write, try_file_lock
+
+
+class OverdueSweeper:
+    def __init__(self, report_path='', interval=3600.0):
+        self.report_path = report_path  # 비어있으면 실행 안 함
+        self.interval = interval        # 실행 간격(초)
+        self.app = None
+
+        self._thread = BackgroundThread(self._loop, name='overdue-sweeper')
+        self._lock_file = None          # 잡고 있는 잠금 파일 (담당 프로세스만)
+
+    def init_app(self, app):
+        self.app = app
+
+    def start(self):
+        # 워커 프로세스마다 호출 (gunicorn post_fork / 로컬 실행)
+        if not self.report_path or self.app is None:
+            return
+        self._thread.ensure_started()
+
+    def _loop(self):
+        while True:
+            try:
+                if self._acquire():
+                    self.sweep()
+            except Exception as e:
+                print(f"[OverdueSweeper] 실패: {e}")
+            time.sleep(self.interval)
+
+    def _acquire(self):
+        # 이미 담당이면 그대로, 아니면 잠금 시도 (다른 프로세스가 잡고 있으면 이번 주기는 건너뜀)
+        if self._lock_file is None:
+            self._lock_file = try_file_lock(self.report_path + '.lock')
+        return self._lock_file is not None
+
+    def sweep(self):
+        # 연체 목록을 report_path 에 JSON 으로 저장 (임시 파일에 쓴 뒤 rename)
+        now = datetime.now(KST)
+        with self.app.app_context():
+            overdue = rental_ledger.list_overdue(now.date())
+        report = {
+            'generated_at': now.strftime('%Y-%m-%d %H:%M:%S'),
+            'count': len(overdue),
+            'data': overdue
+        }
+
+        with atomic_write(self.report_path, prefix='.overdue-') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        return report
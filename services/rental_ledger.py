@@ -0,0 +1,288 @@
+# services/rental_ledger.py
+# 대여 기록(rentals 테이블) 읽기/쓰기 헬퍼
+# - 대여/승인/반납/반려는 행 하나만 INSERT/UPDATE/DELETE (기록이 쌓여도 비용이 늘지 않음)
+# - borrow_log.xlsx 는 더 이상 원본이 아니라, 다운로드 요청 시에만 만드는 내보내기 파일
+# - 쓰기마다 store_versions 의 'rentals' 버전을 올림 → 내보내기 파일은 (필터, 버전) 단위로 재사용
+# - 대시보드용 집계(rental_stats)도 같은 트랜잭션에서 +1/-1 → 대시보드는 전체 기록을 읽지 않음
+import os
+import re
+import json
+import hashlib
+import time
+from datetime import timedelta
+from sqlalchemy import and_, case, func, text
+from models import db, Rental, RentalStat
+from services.db_utils import get_version, bump_version
+from services.xlsx_utils import Workbook, read_rows, to_text
+from services.metrics import metrics
+from services.worker_utils import atomic_path
+
+LOG_COLUMNS = list(Rental.LOG_FIELDS.keys())
+VERSION_KEY = 'rentals'
+EXPORT_NAME = re.compile(r'^rentals-[0-9a-f]+-v(\d+)\.xlsx$')
+# 이전 버전 파일도 마지막으로 넘겨준 뒤 이 시간(초)은 남겨둠 (다른 워커가 경로를 받고 send_file 하기 전에 지우지 않도록)
+EXPORT_KEEP_SECONDS = 300
+
+
+def _from_log_row(row):
+    # 한글 컬럼 dict -> Rental 속성 dict
+    return {attr: to_text(row.get(col)) for col, attr in Rental.LOG_FIELDS.items()}
+
+
+# --- 조회 ---
+def get_rental(log_id):
+    # 프론트에서 넘어온 id 가 비정상이면 None
+    try:
+        log_id = int(log_id)
+    except (TypeError, ValueError):
+        return None
+    return db.session.get(Rental, log_id)
+
+
+# 반납 예정일 = 대여시각 + 7일 (SQL 에서 한 번에 계산)
+# 대여시각이 'YYYY-MM-DD HH:MM:SS' 형식이 아니거나 없는 날짜면 '-' (기존 strptime 실패 시와 동일)
+RENTAL_DAYS = 7
+DATETIME_GLOB = '[0-9][0-9][0-9][0-9]-[0-9][0-9]-[0-9][0-9] [0-9][0-9]:[0-9][0-9]:[0-9][0-9]'
+# SQLite date() 는 '2025-02-30' 도 3월로 넘겨서 계산함 → 정규화한 값이 원래 값과 같을 때만 올바른 날짜
+VALID_BORROWED_AT = and_(
+    Rental.borrowed_at.op('GLOB')(DATETIME_GLOB),
+    func.datetime(Rental.borrowed_at, '+0 days') == Rental.borrowed_at
+)
+DUE_DATE = func.coalesce(
+    case((VALID_BORROWED_AT, func.date(Rental.borrowed_at, f'+{RENTAL_DAYS} days'))),
+    '-'
+)
+
+
+def student_history(name, student_id):
+    # (이름, 학번) 인덱스 사용, 최신순. 응답에 필요한 컬럼만 읽어서 dict 로 반환
+    query = (db.select(Rental.items, Rental.borrowed_at.label('date'), Rental.status,
+                       DUE_DATE.label('due_date'))
+             .where(Rental.name == name, Rental.student_id == student_id)
+             .order_by(Rental.id.desc()))
+    return [dict(row) for row in db.session.execute(query).mappings()]
+
+
+def status_rows(status, with_phone=False):
+    # 대여현황 인덱스 사용, 최신순 (신청 목록 / 미반납 목록)
+    columns = [Rental.id, Rental.borrowed_at.label('date'), Rental.name, Rental.student_id]
+    if with_phone:
+        columns.append(Rental.phone)
+    columns.append(Rental.items)
+    query = db.select(*columns).where(Rental.status == status).order_by(Rental.id.desc())
+    return [dict(row) for row in db.session.execute(query).mappings()]
+
+
+def list_overdue(today, limit=None):
+    # 반납 예정일(대여일 + 7일)이 today 보다 이전인 미반납 기록, 오래된 순
+    # (대여현황, 대여시각) 인덱스 범위 조회 → 전체 기록 수와 상관없이 연체 건수만큼만 읽음
+    cutoff = (today - timedelta(days=RENTAL_DAYS)).isoformat()
+    due_date = func.date(Rental.borrowed_at, f'+{RENTAL_DAYS} days')
+    query = (db.select(Rental.id, Rental.borrowed_at.label('date'), Rental.name, Rental.student_id,
+                       Rental.phone, Rental.items, due_date.label('due_date'),
+                       db.cast(func.julianday(today.isoformat()) - func.julianday(due_date), db.Integer)
+                       .label('days_overdue'))
+             .where(Rental.status == '미반납', Rental.borrowed_at < cutoff, VALID_BORROWED_AT)
+             .order_by(Rental.borrowed_at, Rental.id))
+    if limit:
+        query = query.limit(limit)
+    return [dict(row) for row in db.session.execute(query).mappings()]
+
+
+def all_logs():
+    # 관리자 전체 기록 (최신순, 엑셀과 같은 한글 컬럼) - 필요한 컬럼만 읽어 dict 로 (ORM 객체/DataFrame 을 만들지 않음)
+    rows = db.session.execute(_export_query().order_by(None).order_by(Rental.id.desc()))
+    return [{col: value or '' for col, value in zip(LOG_COLUMNS, row)} for row in rows]
+
+
+def recent(limit=5):
+    # 최근 기록 (기본키 역순이라 테이블 크기와 상관없이 바로 조회)
+    return Rental.query.order_by(Rental.id.desc()).limit(limit).all()
+
+
+# --- 집계 조회 ---
+def get_stats(kind):
+    rows = RentalStat.query.filter_by(kind=kind).all()
+    return {row.key: row.count for row in rows if row.count}
+
+
+def get_stat(kind, key):
+    row = db.session.get(RentalStat, (kind, key))
+    return row.count if row else 0
+
+
+def daily_counts(start, end):
+    # start~end (date, 양 끝 포함) 날짜별 대여 건수, 기록이 없는 날은 0
+    rows = (RentalStat.query
+            .filter(RentalStat.kind == 'day',
+                    RentalStat.key.between(start.isoformat(), end.isoformat()))
+            .all())
+    counts = {row.key: row.count for row in rows}
+    days = (end - start).days + 1
+    return [(start + timedelta(days=i), counts.get((start + timedelta(days=i)).isoformat(), 0))
+            for i in range(days)]
+
+
+# --- 집계 갱신 (대여 기록과 같은 트랜잭션) ---
+STAT_UPSERT = text(
+    'INSERT INTO rental_stats (kind, key, count) VALUES (:kind, :key, :delta) '
+    'ON CONFLICT(kind, key) DO UPDATE SET count = count + excluded.count'
+)
+
+
+def _items(items):
+    return [name for name in (items or '').split(', ') if name]
+
+
+def _rental_deltas(borrowed_at, status, items, delta):
+    # 기록 한 건이 생기거나(+1) 없어질 때(-1) 바뀌는 집계
+    changes = [('status', status, delta)]
+    if borrowed_at:
+        changes.append(('day', borrowed_at[:10], delta))
+    changes += [('item', name, delta) for name in _items(items)]
+    return changes
+
+
+def _apply_stats(conn, changes):
+    if changes:
+        conn.execute(STAT_UPSERT, [{'kind': k, 'key': key, 'delta': d} for k, key, d in changes])
+
+
+def rebuild_stats():
+    # 집계를 기록 전체로부터 다시 계산 (최초 도입 시 / 값이 어긋났을 때)
+    conn = db.session.connection()
+    conn.execute(db.delete(RentalStat))
+    totals = {}
+    for borrowed_at, status, items in conn.execute(
+            db.select(Rental.borrowed_at, Rental.status, Rental.items)).yield_per(1000):
+        for kind, key, delta in _rental_deltas(borrowed_at, status, items, 1):
+            totals[(kind, key)] = totals.get((kind, key), 0) + delta
+    _apply_stats(conn, [(kind, key, count) for (kind, key), count in totals.items()])
+    db.session.commit()
+    return len(totals)
+
+
+def backfill_stats():
+    # 집계 테이블이 비어있고 기록은 있을 때 한 번
+    if RentalStat.query.first() is not None or Rental.query.first() is None:
+        return 0
+    return rebuild_stats()
+
+
+# --- 쓰기 (행 단위, write_transaction() 의 conn 사용) ---
+def append(conn, log_row):
+    values = _from_log_row(log_row)
+    result = conn.execute(db.insert(Rental).values(**values))
+    _apply_stats(conn, _rental_deltas(values['borrowed_at'], values['status'], values['items'], 1))
+    bump_version(conn, VERSION_KEY)
+    return result.inserted_primary_key[0]
+
+
+def transition(conn, rental_id, from_status, **fields):
+    # 현재 상태가 from_status 일 때만 변경 (compare-and-swap)
+    # → 두 관리자가 같은 요청을 동시에 처리해도 한 번만 반영됨. 반영 여부를 반환
+    values = {Rental.LOG_FIELDS[col]: to_text(value) for col, value in fields.items()}
+    result = conn.execute(
+        db.update(Rental)
+        .where(Rental.id == rental_id, Rental.status == from_status)
+        .values(**values)
+    )
+    if result.rowcount != 1:
+        return False
+    to_status = values.get('status', from_status)
+    if to_status != from_status:
+        _apply_stats(conn, [('status', from_status, -1), ('status', to_status, 1)])
+    bump_version(conn, VERSION_KEY)
+    return True
+
+
+def delete(conn, rental_id, from_status):
+    # 반려 = 기록 삭제 → 그 기록이 더했던 집계도 되돌림
+    row = conn.execute(
+        db.select(Rental.borrowed_at, Rental.items)
+        .where(Rental.id == rental_id, Rental.status == from_status)
+    ).first()
+    if row is None:
+        return False
+    conn.execute(db.delete(Rental).where(Rental.id == rental_id))
+    _apply_stats(conn, _rental_deltas(row.borrowed_at, from_status, row.items, -1))
+    bump_version(conn, VERSION_KEY)
+    return True
+
+
+# --- 기존 엑셀 이관 / 내보내기 ---
+def import_legacy_log(path):
+    # rentals 테이블이 비어있을 때 한 번만 기존 borrow_log.xlsx 내용을 옮겨옴
+    if not os.path.exists(path) or Rental.query.first() is not None:
+        return 0
+
+    rows = [_from_log_row(row) for row in read_rows(path)]
+    if rows:
+        db.session.execute(db.insert(Rental), rows)
+        bump_version(db.session.connection(), VERSION_KEY)
+        db.session.commit()
+    return len(rows)
+
+
+def _export_query(start=None, end=None, status=None):
+    # start/end: 'YYYY-MM-DD' (대여시각 기준, 양 끝 포함), status: 대여현황
+    query = db.select(*[getattr(Rental, attr) for attr in Rental.LOG_FIELDS.values()])
+    if start:
+        query = query.where(Rental.borrowed_at >= start)
+    if end:
+        query = query.where(Rental.borrowed_at <= end + ' 23:59:59')
+    if status:
+        query = query.where(Rental.status == status)
+    return query.order_by(Rental.id)
+
+
+def export_log(directory, start=None, end=None, status=None):
+    # 조건에 맞는 대여 기록을 엑셀로 만들고 경로를 반환
+    # 같은 조건 + 같은 데이터 버전의 파일이 이미 있으면 그대로 재사용 (다시 만들지 않음)
+    os.makedirs(directory, exist_ok=True)
+    key = hashlib.sha1(json.dumps([start, end, status]).encode('utf-8')).hexdigest()[:12]
+
+    with db.engine.connect() as conn:
+        # 버전과 행을 같은 읽기 트랜잭션에서 → 파일 내용이 파일명의 버전과 정확히 일치
+        conn.exec_driver_sql('BEGIN')
+        try:
+            version = get_version(conn, VERSION_KEY)[0]
+            path = os.path.join(directory, f'rentals-{key}-v{version}.xlsx')
+            if os.path.exists(path):
+                try:
+                    os.utime(path)  # 넘겨준 시각 기록 → 정리 대상에서 잠시 제외
+                    return path
+                except FileNotFoundError:
+                    pass  # 그 사이 다른 워커가 정리함 → 다시 만듦
+
+            with metrics.stage('excel_write'):
+                # write_only: 행을 메모리에 모아두지 않고 바로 기록
+                wb = Workbook(write_only=True)
+                ws = wb.create_sheet()
+                ws.append(LOG_COLUMNS)
+                rows = conn.execution_options(yield_per=500).execute(_export_query(start, end, status))
+                for row in rows:
+                    ws.append([value or '' for value in row])
+                with atomic_path(path, prefix='.rentals-') as tmp:
+                    wb.save(tmp.path)
+        finally:
+            conn.rollback()
+
+    _remove_old_exports(directory, version)
+    return path
+
+
+def _remove_old_exports(directory, version):
+    # 이전 버전으로 만든 파일 중 EXPORT_KEEP_SECONDS 동안 넘겨준 적 없는 것만 정리
+    # (방금 경로를 받은 워커가 아직 파일을 열기 전일 수 있으므로 버전만 보고 바로 지우지 않음)
+    cutoff = time.time() - EXPORT_KEEP_SECONDS
+    for filename in os.listdir(directory):
+        match = EXPORT_NAME.match(filename)
+        if not match or int(match.group(1)) >= version:
+            continue
+        path = os.path.join(directory, filename)
+        try:
+            if os.path.getmtime(path) < cutoff:
+                os.remove(path)
+        except FileNotFoundError:
+            pass
@@ -0,0 +1,87 @@
+# services/settings_store.py
+# settings.json (시스템 설정) 저장소
+# - 파싱한 설정을 메모리에 두고, 파일 mtime 이 바뀌었을 때만 다시 읽음 (요청마다 open + json 파싱 X)
+# - 저장은 파일 잠금 안에서 최신 내용을 다시 읽고 → 임시 파일에 쓰고 → rename (다른 워커의 수정을 덮어쓰지 않음)
+# - wait_for_change(): 설정이 바뀔 때까지 대기 (SSE 스트림용, 다른 워커에서 바뀐 것도 mtime 으로 감지)
+import os
+import json
+import time
+import threading
+from services.worker_utils import atomic_write, file_lock
+
+
+class SettingsStore:
+    def __init__(self, path, defaults=None, poll_interval=1.0):
+        self.path = path
+        self.defaults = dict(defaults or {})
+        self.poll_interval = poll_interval  # 다른 워커의 변경을 확인하는 간격(초)
+
+        self._lock = threading.Lock()
+        self._changed = threading.Condition(self._lock)
+        self._settings = dict(self.defaults)
+        self._version = None   # 읽어둔 파일의 (mtime_ns, size), 파일이 없으면 ()
+
+    def _stat_version(self):
+        try:
+            st = os.stat(self.path)
+        except FileNotFoundError:
+            return ()
+        return (st.st_mtime_ns, st.st_size)
+
+    def _read_file(self):
+        settings = dict(self.defaults)
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                settings.update(json.load(f))
+        except FileNotFoundError:
+            pass
+        except (ValueError, OSError) as e:
+            print(f"[SettingsStore] {self.path} 읽기 실패, 기본값 사용: {e}")
+        return settings
+
+    def _refresh_locked(self):
+        version = self._stat_version()
+        if version != self._version:
+            self._settings = self._read_file()
+            self._version = version
+            self._changed.notify_all()
+
+    # --- 조회 ---
+    def get(self, key=None, default=None):
+        with self._lock:
+            self._refresh_locked()
+            if key is None:
+                return dict(self._settings)
+            return self._settings.get(key, default)
+
+    def snapshot(self):
+        # (설정, 버전) - 버전은 wait_for_change() 에 넘기는 값
+        with self._lock:
+            self._refresh_locked()
+            return dict(self._settings), self._version
+
+    def wait_for_change(self, version, timeout):
+        # 버전이 바뀌면 (설정, 새 버전), timeout 까지 그대로면 None
+        deadline = time.monotonic() + timeout
+        with self._lock:
+            while True:
+                self._refresh_locked()
+                if self._version != version:
+                    return dict(self._settings), self._version
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return None
+                self._changed.wait(min(self.poll_interval, remaining))  # 같은 워커에서 저장하면 바로 깨어남
+
+    # --- 저장 ---
+    def update(self, **changes):
+        with file_lock(self.path + '.lock'):
+            # 잠금 안에서 최신 내용을 다시 읽고 변경분만 반영
+            settings = self._read_file()
+            settings.update(changes)
+            with atomic_write(self.path, prefix='.settings-', fsync=True) as f:
+                json.dump(settings, f, ensure_ascii=False, indent=4)
+
+        with self._lock:
+            self._refresh_locked()
+            return dict(self._settings)
@@ -0,0 +1,345 @@
+# services/stock_store.py
+# 재고 저장소
+# - 원본은 SQLite(stock_items) → 여러 워커 프로세스가 같은 재고를 보고, 차감은 트랜잭션으로 원자적으로 처리
+# - 각 프로세스는 메모리(dict 인덱스)에 캐시를 두고, store_versions 의 버전이 바뀌었을 때만 다시 읽음
+# - stuff_ongoing.xlsx 는 백그라운드 스레드가 모아서(write-behind) 임시파일 + rename 으로 갱신하는 사본
+# - 관리자가 엑셀을 직접 수정한 경우 mtime 변화를 감지해서 DB 로 다시 가져옴
+# - 여러 건 수정(apply_batch)은 현재 재고와 비교해서 바뀐 행만 한 트랜잭션으로 반영, 결과 버전을 반환
+import os
+import threading
+import time
+from sqlalchemy import bindparam, text
+from models import db
+from services.db_utils import write_transaction, get_version, bump_version, set_file_mtime
+from services.xlsx_utils import Workbook, read_rows, to_text
+from services.worker_utils import BackgroundThread, atomic_path
+from services.metrics import metrics
+
+STOCK_COLUMNS = ['물품', '재고현황', '카테고리']
+VERSION_KEY = 'stock'
+DEFAULT_CATEGORY = '반납물품'  # 카테고리 없이 추가한 물품 (/api/admin/stock/add, batch add 공통)
+
+# 같은 이름이 여러 행에 있으면 기존 동작(첫 번째 행 사용)과 맞춤
+FIRST_ROW_ID = 'SELECT id FROM stock_items WHERE name = :name ORDER BY id LIMIT 1'
+
+
+class ReservationError(Exception):
+    # 대여 신청 시 재고 차감 실패 (메시지는 그대로 사용자에게 보여줌)
+    pass
+
+
+class StockBatchError(Exception):
+    # 여러 건 수정 중 잘못된 작업 (메시지는 그대로 관리자에게 보여줌, 아무것도 반영되지 않음)
+    pass
+
+
+class StockConflictError(Exception):
+    # If-Match 로 받은 버전과 현재 재고 버전이 다름 (다른 관리자/대여 신청이 먼저 수정)
+    def __init__(self, version):
+        super().__init__('다른 곳에서 재고가 먼저 수정되었습니다. 새로고침 후 다시 시도해주세요.')
+        self.version = version
+
+
+def _to_count(value):
+    # pd.to_numeric(errors='coerce').fillna(0).astype(int) 와 같은 규칙
+    try:
+        return int(float(value))
+    except (TypeError, ValueError):
+        return 0
+
+
+def _normalize_row(row):
+    return {
+        '물품': to_text(row.get('물품')),
+        '재고현황': _to_count(row.get('재고현황')),
+        '카테고리': to_text(row.get('카테고리')),
+    }
+
+
+def _insert_rows(conn, rows):
+    if rows:
+        conn.execute(
+            text('INSERT INTO stock_items (name, count, category) VALUES (:물품, :재고현황, :카테고리)'),
+            rows
+        )
+
+
+def _check_version(conn, expected_version):
+    # 쓰기 잠금(BEGIN IMMEDIATE) 안에서 비교 → 비교와 반영 사이에 다른 수정이 끼어들 수 없음
+    version = get_version(conn, VERSION_KEY)[0]
+    if expected_version is not None and expected_version != version:
+        raise StockConflictError(version)
+    return version
+
+
+def _apply_operation(working, op, index):
+    # working: {물품: {'id', 'count', 'category'} 또는 None(삭제됨)} 을 작업 하나만큼 변경
+    if not isinstance(op, dict):
+        raise StockBatchError(f'{index}번째 작업 형식이 잘못되었습니다.')
+    kind = op.get('op')
+    name = to_text(op.get('name')).strip()
+    if not name:
+        raise StockBatchError(f'{index}번째 작업: 물품 이름이 없습니다.')
+    row = working.get(name)
+
+    if kind == 'add':
+        if row is not None:
+            raise StockBatchError(f'{index}번째 작업: {name} 이미 있는 물품입니다.')
+        working[name] = {'id': None, 'count': _to_count(op.get('count')), 'category': to_text(op.get('category')) or DEFAULT_CATEGORY}
+        return
+    if kind not in ('update', 'delete', 'adjust'):
+        raise StockBatchError(f'{index}번째 작업: 지원하지 않는 작업입니다 ({kind}).')
+    if row is None:
+        raise StockBatchError(f'{index}번째 작업: {name} 없는 물품입니다.')
+
+    if kind == 'delete':
+        working[name] = None
+    elif kind == 'update':
+        if 'count' in op:
+            row['count'] = _to_count(op['count'])
+        if 'category' in op:
+            row['category'] = to_text(op['category'])
+    else:
+        delta = op.get('delta')
+        if isinstance(delta, bool) or not isinstance(delta, int):
+            raise StockBatchError(f'{index}번째 작업: delta 는 정수여야 합니다.')
+        if row['count'] < 0:
+            raise StockBatchError(f'{index}번째 작업: {name} 수량을 세지 않는 물품입니다.')
+        if row['count'] + delta < 0:
+            raise StockBatchError(f'{index}번째 작업: {name} 재고가 부족합니다.')
+        row['count'] += delta
+
+
+class StockStore:
+    def __init__(self, path, flush_delay=0.2):
+        self.path = path
+        self.flush_delay = flush_delay  # 연속된 수정을 한 번의 엑셀 저장으로 묶기 위한 대기 시간(초)
+        self.app = None
+
+        self._lock = threading.RLock()
+        self._rows = []        # 엑셀 행 순서 유지용
+        self._index = {}       # '물품' -> row (dict)
+        self._version = None   # 캐시가 반영하고 있는 DB 버전
+        self._dirty = False    # 엑셀 사본을 다시 써야 하는지
+
+        self._flush_event = threading.Event()
+        self._writer = BackgroundThread(self._writer_loop, name='stock-writer')
+        self._io_lock = threading.Lock()  # 파일 쓰기는 한 번에 하나만
+
+    def init_app(self, app):
+        # 백그라운드 스레드에서 DB 를 쓰기 위해 app 을 보관
+        self.app = app
+
+    # --- 캐시 ---
+    def _read_snapshot(self, conn):
+        # 버전과 행을 같은 읽기 트랜잭션에서 가져옴
+        conn.exec_driver_sql('BEGIN')
+        try:
+            version, file_mtime = get_version(conn, VERSION_KEY)
+            rows = conn.execute(text(
+                'SELECT name AS "물품", count AS "재고현황", category AS "카테고리" '
+                'FROM stock_items ORDER BY id'
+            )).mappings().all()
+        finally:
+            conn.rollback()
+        return version, file_mtime, [_normalize_row(row) for row in rows]
+
+    def _refresh(self):
+        with db.engine.connect() as conn:
+            version, file_mtime = get_version(conn, VERSION_KEY)
+
+        disk_mtime = self._current_mtime()
+        if disk_mtime is not None and disk_mtime != file_mtime:
+            # 엑셀이 직접 수정됨 (또는 최초 실행) → DB 로 가져오기
+            self._import_file(disk_mtime)
+        elif disk_mtime is None and file_mtime is not None:
+            # 엑셀 파일이 지워짐 → 다시 만들어 둠
+            self._mark_dirty()
+
+        with self._lock:
+            if version == self._version and disk_mtime == file_mtime:
+                return
+            with db.engine.connect() as conn:
+                version, _, rows = self._read_snapshot(conn)
+            self._set_rows(rows)
+            self._version = version
+
+    def _set_rows(self, rows):
+        self._rows = rows
+        self._index = {}
+        for row in rows:
+            self._index.setdefault(row['물품'], row)
+
+    # --- 조회 (캐시) ---
+    def all(self):
+        return self.snapshot()[0]
+
+    def snapshot(self):
+        # (행 목록, 버전) - 버전은 수정 요청의 If-Match 에 그대로 사용
+        self._refresh()
+        with self._lock:
+            return [dict(row) for row in self._rows], self._version
+
+    def get(self, name):
+        self._refresh()
+        with self._lock:
+            row = self._index.get(name)
+            return dict(row) if row else None
+
+    # --- 수정 (DB 트랜잭션) ---
+    def reserve(self, names, conn):
+        # 선택한 물품을 모두 1개씩 차감. 하나라도 실패하면 ReservationError → 트랜잭션 전체 롤백
+        # conn 은 write_transaction() 으로 연 연결 (대여 기록 저장과 같은 트랜잭션에서 호출)
+        for name in names:
+            result = conn.execute(text(
+                f'UPDATE stock_items SET count = count - 1 WHERE id = ({FIRST_ROW_ID}) AND count > 0'
+            ), {'name': name})
+            if result.rowcount == 0:
+                exists = conn.execute(text(FIRST_ROW_ID), {'name': name}).first()
+                if not exists:
+                    raise ReservationError(f'{name} 없는 물품입니다.')
+                raise ReservationError(f'{name} 재고가 부족합니다.')
+        self._changed(conn)
+
+    def restock(self, names, conn, skip_disposable=False):
+        # 반납/반려 시 재고 복구 (skip_disposable=True 이면 일회용품과 -1 항목은 건너뜀)
+        condition = ''
+        if skip_disposable:
+            condition = " AND COALESCE(category, '') != '일회용품' AND count != -1"
+        for name in names:
+            conn.execute(text(
+                f'UPDATE stock_items SET count = count + 1 WHERE id = ({FIRST_ROW_ID}){condition}'
+            ), {'name': name})
+        self._changed(conn)
+
+    def add(self, name, count, category):
+        with write_transaction() as conn:
+            _insert_rows(conn, [_normalize_row({'물품': name, '재고현황': count, '카테고리': category})])
+            return self._changed(conn)
+
+    def delete(self, name):
+        with write_transaction() as conn:
+            conn.execute(text('DELETE FROM stock_items WHERE name = :name'), {'name': name})
+            return self._changed(conn)
+
+    def replace(self, rows, expected_version=None):
+        with write_transaction() as conn:
+            _check_version(conn, expected_version)
+            conn.execute(text('DELETE FROM stock_items'))
+            _insert_rows(conn, [_normalize_row(row) for row in rows])
+            return self._changed(conn)
+
+    def apply_batch(self, operations, expected_version=None):
+        # operations: [{'op': 'add'|'update'|'delete'|'adjust', 'name': ..., 'count'/'category'/'delta': ...}, ...]
+        # 순서대로 적용한 결과를 현재 재고와 비교해서 바뀐 행만 INSERT/UPDATE/DELETE (전부 반영되거나 하나도 안 됨)
+        # 반환: (버전, {'added': n, 'updated': n, 'deleted': n}) - 바뀐 게 없으면 버전도 그대로
+        with write_transaction() as conn:
+            version = _check_version(conn, expected_version)
+            names = sorted({to_text(op.get('name')).strip() for op in operations if isinstance(op, dict)})
+            current = {}
+            if names:
+                rows = conn.execute(text(
+                    'SELECT id, name, count, category FROM stock_items WHERE name IN :names ORDER BY id'
+                ).bindparams(bindparam('names', expanding=True)), {'names': names}).mappings()
+                for row in rows:
+                    # 같은 이름이 여러 행이면 첫 번째 행 기준 (reserve/restock 과 동일)
+                    current.setdefault(row['name'], {'id': row['id'], 'count': row['count'],
+                                                     'category': row['category'] or ''})
+
+            working = {name: dict(row) for name, row in current.items()}
+            for i, op in enumerate(operations, 1):
+                _apply_operation(working, op, i)
+
+            added, updated, deleted = [], [], []
+            for name, row in working.items():
+                before = current.get(name)
+                if before is not None and (row is None or row['id'] != before['id']):
+                    deleted.append(name)
+                if row is not None and row['id'] is None:
+                    added.append({'물품': name, '재고현황': row['count'], '카테고리': row['category']})
+                elif row is not None and (row['count'], row['category']) != (before['count'], before['category']):
+                    updated.append({'id': row['id'], 'count': row['count'], 'category': row['category']})
+
+            summary = {'added': len(added), 'updated': len(updated), 'deleted': len(deleted)}
+            if not (added or updated or deleted):
+                return version, summary
+
+            if deleted:
+                conn.execute(text('DELETE FROM stock_items WHERE name IN :names')
+                             .bindparams(bindparam('names', expanding=True)), {'names': deleted})
+            if updated:
+                conn.execute(text('UPDATE stock_items SET count = :count, category = :category WHERE id = :id'),
+                             updated)
+            _insert_rows(conn, added)
+            return self._changed(conn), summary
+
+    def _changed(self, conn):
+        version = bump_version(conn, VERSION_KEY)
+        self._mark_dirty()
+        return version
+
+    # --- 엑셀 가져오기 ---
+    def _current_mtime(self):
+        try:
+            return os.stat(self.path).st_mtime_ns
+        except FileNotFoundError:
+            return None
+
+    def _import_file(self, disk_mtime):
+        rows = [_normalize_row(row) for row in read_rows(self.path)]
+        with write_transaction() as conn:
+            # 다른 워커가 이미 가져왔거나 방금 직접 쓴 파일이면 건너뜀
+            _, file_mtime = get_version(conn, VERSION_KEY)
+            if file_mtime == disk_mtime:
+                return
+            conn.execute(text('DELETE FROM stock_items'))
+            _insert_rows(conn, rows)
+            bump_version(conn, VERSION_KEY)
+            set_file_mtime(conn, VERSION_KEY, disk_mtime)
+
+    # --- 엑셀 사본 쓰기 (write-behind) ---
+    def _mark_dirty(self):
+        self._dirty = True
+        self._writer.ensure_started()
+        self._flush_event.set()
+
+    def _writer_loop(self):
+        while True:
+            self._flush_event.wait()
+            # 짧게 기다렸다가 그 사이에 들어온 수정까지 한 번에 저장
+            time.sleep(self.flush_delay)
+            self._flush_event.clear()
+            try:
+                self.flush()
+            except Exception as e:
+                print(f"[StockStore] 저장 실패: {e}")
+
+    def flush(self):
+        if self.app is None:
+            return
+        with self._io_lock, self.app.app_context():
+            while self._dirty:
+                self._dirty = False
+                with db.engine.connect() as conn:
+                    version, _, rows = self._read_snapshot(conn)
+                # 임시 파일에 쓴 뒤 아래에서 rename (commit 하지 않고 나가면 임시 파일은 삭제)
+                with atomic_path(self.path, prefix='.stock-', commit=False) as tmp:
+                    self._write_workbook(rows, tmp.path)
+
+                    with write_transaction() as conn:
+                        # 파일을 만드는 사이 재고가 또 바뀌었으면 이 파일은 버리고 다시 만듦
+                        if get_version(conn, VERSION_KEY)[0] != version:
+                            self._dirty = True
+                            continue
+                        # rename 과 mtime 기록을 같은 잠금 안에서 → 우리가 쓴 파일을 '직접 수정'으로 오인하지 않음
+                        tmp.commit()
+                        set_file_mtime(conn, VERSION_KEY, self._current_mtime())
+
+    @metrics.timed('excel_write')
+    def _write_workbook(self, rows, path):
+        wb = Workbook(write_only=True)
+        ws = wb.create_sheet()
+        ws.append(STOCK_COLUMNS)
+        for row in rows:
+            ws.append([row[col] for col in STOCK_COLUMNS])
+        wb.save(path)
@@ -0,0 +1,229 @@
+# services/teaser_entries.py
+# 티저 이벤트 응모 기록(teaser_entries 테이블) 헬퍼
+# - 관리자 목록은 페이지 단위로 DB 에서 바로 조회 (CSV 전체를 pandas 로 읽지 않음)
+# - 다운로드(CSV/XLSX)는 한 번에 몇백 행씩 읽어서 흘려보냄 → 응모가 많아도 워커 메모리가 늘지 않음
+# - 응모 저장은 TeaserWriter 가 모아서 한 트랜잭션(commit 1번)으로 처리 (group commit)
+import csv
+import io
+import os
+import queue
+import tempfile
+import threading
+import time
+from sqlalchemy import and_, or_, text
+from models import db, TeaserEntry
+from services.db_utils import write_transaction
+from services.xlsx_utils import Workbook, to_text
+from services.worker_utils import BackgroundThread
+
+TEASER_COLUMNS = list(TeaserEntry.CSV_FIELDS.keys())
+EXPORT_BATCH = 500
+
+
+def normalize_phone(phone):
+    # 숫자로 저장되어 앞자리 0 이 빠진 번호('1012345678') 복구
+    phone = to_text(phone).strip()
+    return '0' + phone if phone.startswith('10') else phone
+
+
+def _from_csv_row(row):
+    values = {attr: to_text(row.get(col)).strip() for col, attr in TeaserEntry.CSV_FIELDS.items()}
+    values['phone'] = normalize_phone(values['phone'])
+    return values
+
+
+# --- 조회 ---
+# field 로 지정하면 앞부분 일치로 인덱스를 타는 컬럼 (학번 '2025', 신청일 '2025-09-01' 등)
+PREFIX_FIELDS = {
+    'student_id': TeaserEntry.student_id,
+    'entered_at': TeaserEntry.entered_at,
+}
+
+
+def _prefix(column, q):
+    # LIKE 'q%' 대신 범위 조건 → SQLite 가 (기본 BINARY 정렬) 인덱스를 그대로 사용
+    return and_(column >= q, column < q + '\U0010ffff')
+
+
+def search(q=None, field=None):
+    # 최신순 (신청시각 인덱스)
+    # - field 없음: 이름/학번/학과/전화번호 부분 일치 (전체 스캔)
+    # - field='student_id'|'entered_at': 그 컬럼 앞부분 일치 (인덱스 범위 조회)
+    query = TeaserEntry.query
+    if field and field not in PREFIX_FIELDS:
+        raise ValueError(f'지원하지 않는 검색 항목입니다 ({field}).')
+    if q and field:
+        query = query.filter(_prefix(PREFIX_FIELDS[field], q))
+    elif q:
+        query = query.filter(or_(
+            TeaserEntry.name.contains(q, autoescape=True),
+            TeaserEntry.student_id.contains(q, autoescape=True),
+            TeaserEntry.department.contains(q, autoescape=True),
+            TeaserEntry.phone.contains(q, autoescape=True),
+        ))
+    return query.order_by(TeaserEntry.entered_at.desc(), TeaserEntry.id.desc())
+
+
+# --- 쓰기 (묶음 저장) ---
+# 같은 학번이 없을 때만 INSERT → 다른 워커가 방금 넣은 응모도 BEGIN IMMEDIATE 잠금 안에서 걸러짐
+INSERT_SQL = text(
+    'INSERT INTO teaser_entries (entered_at, name, student_id, department, phone, agreed) '
+    'SELECT :entered_at, :name, :student_id, :department, :phone, :agreed '
+    'WHERE NOT EXISTS (SELECT 1 FROM teaser_entries WHERE student_id = :student_id)'
+)
+
+
+class DuplicateEntryError(Exception):
+    # 이미 응모한 학번 (메시지는 그대로 사용자에게 보여줌)
+    pass
+
+
+class _PendingEntry:
+    def __init__(self, values):
+        self.values = values
+        self.done = threading.Event()
+        self.inserted = False
+        self.error = None
+
+
+class TeaserWriter:
+    def __init__(self, batch_size=200, batch_wait=0.02, timeout=10):
+        self.batch_size = batch_size  # 한 번에 저장할 최대 응모 수
+        self.batch_wait = batch_wait  # 첫 응모 후 같이 묶을 응모를 기다리는 시간(초)
+        self.timeout = timeout        # 요청이 저장 결과를 기다리는 최대 시간(초)
+        self.app = None
+
+        self._queue = queue.Queue()
+        self._seen = None             # 이미 응모한 학번 (처음 저장할 때 DB 에서 읽음)
+        self._writer = BackgroundThread(self._writer_loop, name='teaser-writer')
+        self._io_lock = threading.Lock()
+
+    def init_app(self, app):
+        self.app = app
+
+    def add(self, entered_at, name, student_id, department, phone, agreed):
+        # 묶음 저장이 끝날 때까지 기다림. 중복이면 DuplicateEntryError
+        entry = _PendingEntry({
+            'entered_at': entered_at, 'name': name, 'student_id': student_id, 'department': department,
+            'phone': normalize_phone(phone), 'agreed': 'Y' if agreed else 'N'
+        })
+        self._writer.ensure_started()
+        self._queue.put(entry)
+        if not entry.done.wait(self.timeout):
+            raise TimeoutError('응모 저장이 지연되고 있습니다. 잠시 후 다시 시도해주세요.')
+        if entry.error:
+            raise entry.error
+        if not entry.inserted:
+            raise DuplicateEntryError('이미 응모한 학번입니다.')
+
+    def _writer_loop(self):
+        while True:
+            batch = [self._queue.get()]
+            # 짧게 기다리면서 그 사이 들어온 응모까지 한 번에 저장
+            deadline = time.monotonic() + self.batch_wait
+            while len(batch) < self.batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            self._commit(batch)
+
+    def flush(self):
+        # 종료 시: 대기 중인 응모를 바로 저장
+        batch = []
+        while True:
+            try:
+                batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        if batch:
+            self._commit(batch)
+
+    def _commit(self, batch):
+        if self.app is None:
+            return
+        with self._io_lock, self.app.app_context():
+            try:
+                with write_transaction() as conn:
+                    if self._seen is None:
+                        self._seen = {row[0] for row in conn.execute(text('SELECT student_id FROM teaser_entries'))}
+                    results = []
+                    for entry in batch:
+                        student_id = entry.values['student_id']
+                        if student_id in self._seen:
+                            results.append(False)
+                            continue
+                        results.append(conn.execute(INSERT_SQL, entry.values).rowcount == 1)
+                        self._seen.add(student_id)
+            except Exception as e:
+                # 롤백됐으므로 학번 목록은 다음에 DB 에서 다시 읽음
+                self._seen = None
+                for entry in batch:
+                    entry.error = e
+                    entry.done.set()
+                return
+
+        for entry, inserted in zip(batch, results):
+            entry.inserted = inserted
+            entry.done.set()
+
+
+# --- 기존 CSV 이관 ---
+def import_legacy_csv(path):
+    # teaser_entries 테이블이 비어있을 때 한 번만 기존 teaser_entries.csv 내용을 옮겨옴
+    if not os.path.exists(path) or TeaserEntry.query.first() is not None:
+        return 0
+
+    with open(path, newline='', encoding='utf-8-sig') as f:
+        rows = [_from_csv_row(row) for row in csv.DictReader(f)]
+    if rows:
+        db.session.execute(db.insert(TeaserEntry), rows)
+        db.session.commit()
+    return len(rows)
+
+
+# --- 내보내기 (스트리밍) ---
+def _iter_rows(query):
+    for entry in query.yield_per(EXPORT_BATCH):
+        yield [getattr(entry, attr) or '' for attr in TeaserEntry.CSV_FIELDS.values()]
+
+
+def iter_csv(query):
+    # 엑셀에서 한글이 깨지지 않도록 BOM 포함 (기존 파일과 같은 utf-8-sig)
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    buffer.write('\ufeff')
+    writer.writerow(TEASER_COLUMNS)
+    for i, row in enumerate(_iter_rows(query), 1):
+        writer.writerow(row)
+        if i % EXPORT_BATCH == 0:
+            yield buffer.getvalue().encode('utf-8')
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue().encode('utf-8')
+
+
+def iter_xlsx(query, chunk_size=64 * 1024):
+    # xlsx 는 zip 이라 행 단위로 바로 보낼 수 없음
+    # → write_only 모드(행을 메모리에 들고 있지 않음)로 임시 파일에 쓴 뒤 조각으로 나눠 보내고 삭제
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet()
+    ws.append(TEASER_COLUMNS)
+    for row in _iter_rows(query):
+        ws.append(row)
+
+    fd, tmp_path = tempfile.mkstemp(prefix='.teaser-', suffix='.xlsx')
+    os.close(fd)
+    try:
+        wb.save(tmp_path)
+        with open(tmp_path, 'rb') as f:
+            while True:
+                chunk = f.read(chunk_size)
+                if not chunk:
+                    break
+                yield chunk
+    finally:
+        os.remove(tmp_path)
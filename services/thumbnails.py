@@ -0,0 +1,129 @@
+# services/thumbnails.py
+# 업로드 이미지의 축소본(WebP/JPEG) 생성 및 선택
+# - 원본 옆에 '<원본파일명>.w<너비>.webp' / '.jpg' 로 저장 (예: 1700000000_a.png.w640.webp)
+# - 업로드 시 미리 만들고, 예전에 올린 이미지는 처음 요청될 때 만듦 (원본이 바뀌면 다시 만듦)
+# - Pillow 가 없으면 축소본 없이 원본을 그대로 사용
+import os
+import re
+import threading
+from flask import request
+from werkzeug.security import safe_join
+from services.uploads import send_upload
+from services.worker_utils import atomic_path
+
+try:
+    from PIL import Image, ImageOps, features
+except ImportError:
+    Image = None
+
+WIDTHS = (320, 640, 1280)   # 만들어 두는 너비 (요청한 w 는 이 중 가까운 큰 값으로 맞춤)
+WEBP_QUALITY = 80
+JPEG_QUALITY = 82
+
+VARIANT_PATTERN = re.compile(r'\.w\d+\.(webp|jpg)$')
+
+_lock = threading.Lock()
+_generated = {}  # 원본 경로 -> 축소본을 만들 때의 원본 mtime (이 프로세스에서 이미 시도한 것)
+
+
+def _webp_supported():
+    return Image is not None and features.check('webp')
+
+
+def snap_width(width):
+    # 임의의 너비로 파일이 무한히 생기지 않도록 정해진 너비로 맞춤
+    for w in WIDTHS:
+        if width <= w:
+            return w
+    return WIDTHS[-1]
+
+
+def variant_name(filename, width, ext):
+    return f'{filename}.w{width}.{ext}'
+
+
+def srcset(url, widths=WIDTHS, version=None):
+    # <img srcset> 용 문자열
+    suffix = f'&v={version}' if version else ''
+    return ', '.join(f'{url}?w={w}{suffix} {w}w' for w in widths)
+
+
+def _is_fresh(path, source_mtime):
+    try:
+        return os.stat(path).st_mtime >= source_mtime
+    except FileNotFoundError:
+        return False
+
+
+def _save(image, path, image_format, **options):
+    # 임시 파일에 다 쓴 뒤 rename → 다른 워커가 쓰다 만 축소본을 (1년 캐시로) 보내는 일이 없음
+    with atomic_path(path, prefix='.variant-') as tmp:
+        image.save(tmp.path, image_format, **options)
+
+
+def make_variants(folder, filename, widths=WIDTHS):
+    # 원본보다 작은 너비마다 WebP + JPEG 축소본 생성. 만든 파일 수 반환
+    if Image is None:
+        return 0
+    source = os.path.join(folder, filename)
+    created = 0
+    with Image.open(source) as img:
+        if getattr(img, 'is_animated', False):
+            return 0  # 움직이는 GIF 는 원본 그대로 사용
+        img = ImageOps.exif_transpose(img)
+        for width in widths:
+            if width >= img.width:
+                continue
+            height = round(img.height * width / img.width)
+            resized = img.resize((width, height), Image.LANCZOS)
+            if _webp_supported():
+                _save(resized, os.path.join(folder, variant_name(filename, width, 'webp')),
+                      'WEBP', quality=WEBP_QUALITY, method=4)
+                created += 1
+            rgb = resized.convert('RGB') if resized.mode != 'RGB' else resized
+            _save(rgb, os.path.join(folder, variant_name(filename, width, 'jpg')),
+                  'JPEG', quality=JPEG_QUALITY, optimize=True, progressive=True)
+            created += 1
+    return created
+
+
+def pick_variant(folder, filename, width, accept_webp):
+    # 요청 너비에 맞는 축소본 파일명 (없으면 필요할 때 만들고, 만들 수 없으면 원본 파일명)
+    source = safe_join(folder, filename)
+    if Image is None or source is None or VARIANT_PATTERN.search(filename) or not os.path.isfile(source):
+        return filename
+
+    width = snap_width(width)
+    ext = 'webp' if accept_webp and _webp_supported() else 'jpg'
+    name = variant_name(filename, width, ext)
+    path = os.path.join(folder, name)
+    source_mtime = os.stat(source).st_mtime
+    if not _is_fresh(path, source_mtime) and _generated.get(source) != source_mtime:
+        with _lock:
+            if not _is_fresh(path, source_mtime) and _generated.get(source) != source_mtime:
+                _generated[source] = source_mtime
+                try:
+                    make_variants(folder, filename)
+                except OSError:
+                    return filename  # 이미지가 아니거나 깨진 파일
+    # 원본이 이 너비보다 작으면 축소본이 없음 → 원본
+    return name if os.path.exists(path) else filename
+
+
+def delete_variants(folder, filename):
+    for width in WIDTHS:
+        for ext in ('webp', 'jpg'):
+            path = os.path.join(folder, variant_name(filename, width, ext))
+            if os.path.exists(path):
+                os.remove(path)
+
+
+def send_image(folder, filename):
+    # ?w=640 이 있으면 그 너비의 축소본 (브라우저가 WebP 를 받으면 WebP, 아니면 JPEG)
+    width = request.args.get('w', type=int)
+    if not width:
+        return send_upload(folder, filename)
+    accept_webp = 'image/webp' in request.headers.get('Accept', '')
+    response = send_upload(folder, pick_variant(folder, filename, width, accept_webp), source=filename)
+    response.vary.add('Accept')
+    return response
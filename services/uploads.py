@@ -0,0 +1,89 @@
+# services/uploads.py
+# 업로드 파일(공지 첨부, 인스타/캠퍼스 이미지) 전송
+# - 내용 해시로 강한 ETag, URL 에 ?v=<해시> 를 붙여 쓰면 1년 + immutable 캐시 (내용이 바뀌면 URL 도 바뀜)
+# - ?v= 가 없거나 옛 값이면 no-cache (ETag 로 재검증 → 304)
+# - Range / If-None-Match / If-Modified-Since 처리는 send_file(conditional=True)
+# - UPLOAD_OFFLOAD=x-accel 이면 nginx(X-Accel-Redirect), x-sendfile 이면 Apache 등(X-Sendfile)이 파일 전송을 대신함
+import os
+import stat
+import hashlib
+from flask import abort, current_app, request, send_file
+from werkzeug.security import safe_join
+from config import UPLOAD_DIR
+
+IMMUTABLE_MAX_AGE = 365 * 24 * 3600
+
+_hashes = {}  # 경로 -> (mtime_ns, size, sha1) : 파일이 바뀌었을 때만 다시 읽음
+
+
+def _stat_file(path):
+    try:
+        st = os.stat(path)
+    except (FileNotFoundError, NotADirectoryError):
+        return None
+    return st if stat.S_ISREG(st.st_mode) else None
+
+
+def content_hash(path, st=None):
+    path = os.path.abspath(path)
+    st = st or _stat_file(path)
+    if st is None:
+        return None
+    cached = _hashes.get(path)
+    if cached and cached[0] == st.st_mtime_ns and cached[1] == st.st_size:
+        return cached[2]
+    digest = hashlib.sha1()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(chunk)
+    _hashes[path] = (st.st_mtime_ns, st.st_size, digest.hexdigest())
+    return _hashes[path][2]
+
+
+def fingerprint(folder, filename):
+    # URL 에 붙일 짧은 해시 (파일이 없으면 None)
+    path = safe_join(folder, filename)
+    digest = content_hash(path) if path else None
+    return digest[:12] if digest else None
+
+
+def versioned_url(url, folder, filename):
+    # '/api/.../image/a.png?w=640' → '...&v=<해시>' (파일이 없으면 그대로)
+    version = fingerprint(folder, filename)
+    if not version:
+        return url
+    return f"{url}{'&' if '?' in url else '?'}v={version}"
+
+
+def send_upload(folder, filename, source=None, as_attachment=False, download_name=None):
+    # source: 축소본을 보낼 때 원본 파일명 (?v= 는 원본 기준)
+    path = safe_join(folder, filename)
+    st = _stat_file(path) if path else None
+    if st is None:
+        abort(404)
+    etag = content_hash(path, st)
+
+    version = request.args.get('v')
+    immutable = bool(version) and version == fingerprint(folder, source or filename)
+
+    offload = current_app.config.get('UPLOAD_OFFLOAD')
+    response = send_file(path, as_attachment=as_attachment, download_name=download_name,
+                         etag=etag, last_modified=st.st_mtime, max_age=None,
+                         conditional=offload != 'x-accel')
+
+    if offload == 'x-accel':
+        # 헤더만 만들고 본문은 nginx 가 internal location 에서 직접 전송 (Range 도 nginx 가 처리)
+        response.close()
+        response.set_data(b'')
+        relative = os.path.relpath(os.path.abspath(path), os.path.abspath(UPLOAD_DIR)).replace(os.sep, '/')
+        response.headers['X-Accel-Redirect'] = current_app.config['UPLOAD_ACCEL_PREFIX'].rstrip('/') + '/' + relative
+        response = response.make_conditional(request)
+
+    if immutable:
+        response.cache_control.no_cache = None
+        response.cache_control.public = True
+        response.cache_control.max_age = IMMUTABLE_MAX_AGE
+        response.cache_control.immutable = True
+    else:
+        response.cache_control.no_cache = True
+    return response
@@ -0,0 +1,53 @@
+# services/view_counter.py
+# 공지 조회수 누적기 (write-behind)
+# - 조회할 때마다 UPDATE + commit 하면 읽기 요청마다 SQLite 쓰기 잠금/fsync 가 발생
+# - 프로세스 메모리에 {공지 id: 늘어난 횟수} 를 모아두고, 일정 간격(또는 종료 시)에 한 트랜잭션으로 반영
+import threading
+from sqlalchemy import text
+from services.db_utils import write_transaction
+from services.worker_utils import BackgroundThread
+
+
+class ViewCounter:
+    def __init__(self, flush_interval=5.0):
+        self.flush_interval = flush_interval  # DB 반영 간격(초)
+        self.app = None
+
+        self._lock = threading.Lock()
+        self._pending = {}  # notice_id -> 아직 DB 에 반영 안 된 조회수
+        self._writer = BackgroundThread(self.flush, name='view-writer', interval=flush_interval)
+        self._io_lock = threading.Lock()
+
+    def init_app(self, app):
+        self.app = app
+
+    def add(self, notice_id, count=1):
+        with self._lock:
+            self._pending[notice_id] = self._pending.get(notice_id, 0) + count
+        self._writer.ensure_started()
+
+    def pending(self, notice_id):
+        # 화면에 보여줄 조회수 = DB 값 + 이 값
+        with self._lock:
+            return self._pending.get(notice_id, 0)
+
+    def flush(self):
+        if self.app is None:
+            return
+        with self._io_lock:
+            with self._lock:
+                batch, self._pending = self._pending, {}
+            if not batch:
+                return
+            try:
+                with self.app.app_context(), write_transaction() as conn:
+                    conn.execute(
+                        text('UPDATE notices SET views = COALESCE(views, 0) + :count WHERE id = :id'),
+                        [{'id': notice_id, 'count': count} for notice_id, count in batch.items()]
+                    )
+            except Exception:
+                # 실패한 만큼 다시 돌려놓고 다음 주기에 재시도
+                with self._lock:
+                    for notice_id, count in batch.items():
+                        self._pending[notice_id] = self._pending.get(notice_id, 0) + count
+                raise
@@ -0,0 +1,110 @@
+# services/worker_utils.py
+# 여러 워커 프로세스(gunicorn fork)가 같은 파일/자원을 쓸 때 필요한 공용 헬퍼
+# - file_lock / try_file_lock: 프로세스 간 파일 잠금 (fcntl 이 없는 윈도우 로컬 개발에서는 잠금 없이 실행)
+# - atomic_path / atomic_write: 같은 폴더의 임시 파일에 쓴 뒤 rename → 읽는 쪽이 반쯤 쓰인 파일을 볼 일이 없음
+# - BackgroundThread: fork 된 워커에는 마스터의 스레드가 없으므로 처음 필요할 때 (다시) 시작하는 데몬 스레드
+import os
+import time
+import tempfile
+import threading
+from contextlib import contextmanager
+
+try:
+    import fcntl  # 리눅스/도커 환경 (윈도우 로컬 개발 시에는 없음)
+except ImportError:
+    fcntl = None
+
+
+# --- 파일 잠금 ---
+@contextmanager
+def file_lock(path):
+    # 배타 잠금을 잡을 때까지 대기
+    lock_file = open(path, 'w')
+    try:
+        if fcntl:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+        yield
+    finally:
+        if fcntl:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+        lock_file.close()
+
+
+def try_file_lock(path):
+    # 기다리지 않고 잠금 시도 → 잡았으면 열린 파일(닫으면 해제), 다른 프로세스가 잡고 있으면 None
+    lock_file = open(path, 'w')
+    if fcntl is None:
+        return lock_file
+    try:
+        fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        lock_file.close()
+        return None
+    return lock_file
+
+
+# --- 원자적 파일 쓰기 ---
+class TempFile:
+    def __init__(self, target, prefix):
+        directory = os.path.dirname(target) or '.'
+        os.makedirs(directory, exist_ok=True)
+        fd, self.path = tempfile.mkstemp(prefix=prefix, suffix=os.path.splitext(target)[1], dir=directory)
+        os.close(fd)
+        self.target = target
+        self.committed = False
+
+    def commit(self):
+        os.replace(self.path, self.target)
+        self.committed = True
+
+
+@contextmanager
+def atomic_path(path, prefix='.tmp-', commit=True):
+    # 임시 파일(TempFile.path)에 쓰고 블록이 정상 종료되면 path 로 rename, 예외가 나면 임시 파일 삭제
+    # commit=False: 직접 tmp.commit() 을 호출한 경우에만 rename (호출하지 않고 블록을 나가면 버림)
+    tmp = TempFile(path, prefix)
+    try:
+        yield tmp
+        if commit and not tmp.committed:
+            tmp.commit()
+    finally:
+        if not tmp.committed and os.path.exists(tmp.path):
+            os.remove(tmp.path)
+
+
+@contextmanager
+def atomic_write(path, mode='w', prefix='.tmp-', fsync=False):
+    # atomic_path 와 같지만 열린 파일을 넘겨줌 (텍스트 모드는 utf-8)
+    encoding = None if 'b' in mode else 'utf-8'
+    with atomic_path(path, prefix) as tmp:
+        with open(tmp.path, mode, encoding=encoding) as f:
+            yield f
+            if fsync:
+                f.flush()
+                os.fsync(f.fileno())
+
+
+# --- 백그라운드 스레드 ---
+class BackgroundThread:
+    def __init__(self, target, name, interval=None):
+        # interval 이 있으면 interval 초마다 target() 반복 (실패해도 다음 주기에 다시 실행)
+        self.target = target
+        self.name = name
+        self.interval = interval
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def ensure_started(self):
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                run = self.target if self.interval is None else self._run_periodic
+                self._thread = threading.Thread(target=run, name=self.name, daemon=True)
+                self._thread.start()
+
+    def _run_periodic(self):
+        while True:
+            time.sleep(self.interval)
+            try:
+                self.target()
+            except Exception as e:
+                print(f"[{self.name}] 실패: {e}")
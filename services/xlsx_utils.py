@@ -0,0 +1,40 @@
+# services/xlsx_utils.py
+# pandas 없이 openpyxl 로 엑셀 첫 시트를 읽는 헬퍼
+# openpyxl 은 엑셀을 실제로 읽고/쓸 때만 불러옴 (워커 시작 시간 단축)
+# → 다른 모듈도 openpyxl 을 직접 import 하지 말고 아래 Workbook() / load_workbook() 사용
+from services.metrics import metrics
+
+
+def Workbook(*args, **kwargs):
+    from openpyxl import Workbook as _Workbook
+    return _Workbook(*args, **kwargs)
+
+
+def load_workbook(*args, **kwargs):
+    from openpyxl import load_workbook as _load_workbook
+    return _load_workbook(*args, **kwargs)
+
+
+def to_text(value):
+    # 셀 값 → 문자열 (빈 칸은 '')
+    return '' if value is None else str(value)
+
+
+@metrics.timed('excel_read')
+def read_rows(path):
+    # 첫 행을 헤더로 보고 {컬럼명: 값} 리스트 반환 (빈 행은 건너뜀, 빈 칸은 None)
+    wb = load_workbook(path, read_only=True, data_only=True)
+    try:
+        it = wb.active.iter_rows(values_only=True)
+        header = next(it, None)
+        if not header:
+            return []
+        header = ['' if h is None else str(h).strip() for h in header]
+        rows = []
+        for values in it:
+            if values is None or all(v is None for v in values):
+                continue
+            rows.append(dict(zip(header, values)))
+        return rows
+    finally:
+        wb.close()